@@ -1,28 +1,272 @@
+"""Train the supplier risk model.
+
+    python train_supplier_risk_model.py ledgers/*.csv --jobs -1 --state models/ledger_state
+
+Inputs are sample_supplier_data.csv-schema PO ledgers (turned into
+per-supplier features by vendowise_features, one worker process per file) or
+pre-built feature tables with Avg_Delay_Days/Rejection_Rate columns and an
+optional High_Risk label. Tables larger than --max-rows are uniformly
+subsampled while they are read, so they never have to fit in memory. Every
+run writes a versioned model plus a JSON schema (features, label, parameters,
+timings, peak RSS) to --out-dir and publishes it as the served model.
+Without inputs the --state features are retrained on, or, when there is no
+state either, a seeded synthetic ledger; synthetic rows are never persisted.
+
+Label limitation: rows without a High_Risk label (all ledger and --state
+rows, and feature tables without the column) are labelled by
+threshold_labels(), i.e. the same delay/rejection thresholds applied to the
+same two features the model sees. The model then only learns a smoothed copy
+of the threshold rule, not an independent outcome; supply labelled feature
+tables (e.g. suppliers later escalated or delisted) for a real risk model.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
 import numpy as np
+import pandas as pd
+import sklearn
 from sklearn.ensemble import RandomForestClassifier
-import joblib
+
+from vendowise_batch import expand_inputs
+from vendowise_config import CONFIG_PATH, load_config
+from vendowise_features import LedgerFeatures
+from vendowise_forest import export_forest, forest_paths
+from vendowise_ingest import DEFAULT_CHUNK_ROWS, iter_typed_chunks
+from vendowise_model import FEATURES, MODEL_PATH, schema_path
+from vendowise_synthetic import generate_supplier_ledger
+
+MODEL_DIR = "models"
+MODEL_NAME = "supplier_risk_model"
+LABEL_COLUMN = "High_Risk"
+DEFAULT_MAX_ROWS = 2_000_000
+
 
 # ----------------------------
 # 1. Prepare training data
 # ----------------------------
-# Features: [Avg_Delay_Days, Rejection_Rate]
-X = np.array([
-    [2, 0.02],
-    [7, 0.07],
-    [4, 0.04],
-    [10, 0.10],
-    [1, 0.01]
-])
-y = np.array([0, 1, 0, 1, 0])
+def input_kind(path):
+    columns = pd.read_csv(path, nrows=0).columns
+    if "Promised_Date" in columns:
+        return "ledger"
+    if all(col in columns for col in FEATURES):
+        return "features"
+    raise ValueError(f"{path} is neither a PO ledger nor a feature table")
+
+
+def ledger_state(path, chunksize=DEFAULT_CHUNK_ROWS):
+    """LedgerFeatures for one ledger file; runs on a worker process."""
+    state = LedgerFeatures()
+    for chunk in iter_typed_chunks(path, "ledger", chunksize):
+        state.append(chunk)
+    return state
+
+
+def sample_rows(chunks, max_rows, seed=0):
+    """Uniform sample of at most max_rows rows from an iterable of DataFrames.
+
+    Every row gets a random key and the max_rows smallest keys are kept, so at
+    most max_rows rows plus one chunk are in memory. Returns (sample, rows seen).
+    """
+    rng = np.random.default_rng(seed)
+    kept, keys, seen = None, np.empty(0), 0
+    for chunk in chunks:
+        seen += len(chunk)
+        kept = chunk if kept is None else pd.concat([kept, chunk], ignore_index=True)
+        keys = np.concatenate([keys, rng.random(len(chunk))])
+        if len(kept) > max_rows:
+            top = np.sort(np.argpartition(keys, max_rows - 1)[:max_rows])
+            kept, keys = kept.iloc[top].reset_index(drop=True), keys[top]
+    return kept, seen
+
+
+def feature_table_chunks(paths, chunksize=DEFAULT_CHUNK_ROWS):
+    for path in paths:
+        columns = [col for col in FEATURES + [LABEL_COLUMN] if col in pd.read_csv(path, nrows=0).columns]
+        yield from pd.read_csv(path, usecols=columns, dtype="float32", chunksize=chunksize)
+
+
+def threshold_labels(features, thresholds):
+    """1 where a supplier breaches the configured delay or rejection threshold.
+
+    A fallback when no outcome labels are supplied: it is a function of the
+    model's own features, so it cannot tell the model anything the rule doesn't.
+    """
+    return ((features["Avg_Delay_Days"] > thresholds["delay_days"]) |
+            (features["Rejection_Rate"] > thresholds["rejection_rate"])).astype("int8")
+
+
+THRESHOLD_LABEL = "Avg_Delay_Days > delay_days or Rejection_Rate > rejection_rate (derived from the features)"
+
+
+def training_labels(table, thresholds):
+    """(labels, description) for the schema.
+
+    Rows without a High_Risk label (ledger and --state features, or feature
+    tables without the column) are labelled with threshold_labels(), per row.
+    """
+    derived = threshold_labels(table, thresholds)
+    if LABEL_COLUMN not in table.columns or table[LABEL_COLUMN].isna().all():
+        return derived.to_numpy(), THRESHOLD_LABEL
+    labelled = table[LABEL_COLUMN].notna()
+    y = table[LABEL_COLUMN].where(labelled, derived).to_numpy(dtype="int8")
+    if labelled.all():
+        return y, LABEL_COLUMN
+    return y, f"{LABEL_COLUMN} where supplied ({int(labelled.sum())} rows), else {THRESHOLD_LABEL}"
+
+
+def build_training_table(inputs, max_rows, workers=None, state_prefix=None, seed=0, chunksize=DEFAULT_CHUNK_ROWS):
+    """(table, rows seen) with FEATURES columns and, when the inputs carry one, the label."""
+    ledgers = [path for path in inputs if input_kind(path) == "ledger"]
+    tables = [path for path in inputs if path not in ledgers]
+
+    parts, seen = [], 0
+    if ledgers or state_prefix or not inputs:
+        state = LedgerFeatures()
+        if state_prefix and os.path.exists(f"{state_prefix}-totals.arrow"):
+            state = LedgerFeatures.load(state_prefix)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(ledger_state, ledgers, [chunksize] * len(ledgers)):
+                state.merge(part)
+        if state_prefix and ledgers:
+            state.save(state_prefix)
+        if not inputs and len(state) == 0:
+            # demo run: the synthetic ledger is only used for this fit, never saved to the state
+            state = LedgerFeatures().append(generate_supplier_ledger(20_000, seed=42))
+        features = state.features()[FEATURES]
+        seen += len(features)
+        parts.append(features.reset_index(drop=True))
+    if tables:
+        sample, table_rows = sample_rows(feature_table_chunks(tables, chunksize), max_rows, seed)
+        seen += table_rows
+        parts.append(sample)
+
+    table = pd.concat(parts, ignore_index=True).dropna(subset=FEATURES)
+    if len(table) > max_rows:
+        table, _ = sample_rows([table], max_rows, seed)
+    return table, seen
+
 
 # ----------------------------
 # 2. Train the model
 # ----------------------------
-model = RandomForestClassifier(n_estimators=10, random_state=42)
-model.fit(X, y)
+def peak_rss_mb(who="self"):
+    """Peak resident memory of this process (or its finished workers); None where unsupported.
+
+    Unlike tracemalloc this includes the trees' native allocations.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    return usage.ru_maxrss / (1024 ** 2 if sys.platform == "darwin" else 1024)
+
+
+def train(table, thresholds, trees=100, jobs=-1, min_leaf=1, max_depth=None, seed=42):
+    """Fit the forest; returns (model, y, label description, seconds)."""
+    X = table[FEATURES].to_numpy(dtype="float32")
+    y, label = training_labels(table, thresholds)
+    if len(np.unique(y)) < 2:
+        raise ValueError("Training needs both low- and high-risk suppliers; use a larger ledger.")
+
+    model = RandomForestClassifier(n_estimators=trees, n_jobs=jobs, min_samples_leaf=min_leaf,
+                                   max_depth=max_depth, random_state=seed)
+    start = time.perf_counter()
+    model.fit(X, y)
+    return model, y, label, time.perf_counter() - start
+
 
 # ----------------------------
 # 3. Save the model
 # ----------------------------
-joblib.dump(model, "mock_supplier_risk_model.pkl")
-print("✅ Model saved as 'mock_supplier_risk_model.pkl'")
+def model_version():
+    """UTC timestamp with microseconds plus the pid, so concurrent runs never share artifact names."""
+    now = time.time()
+    return f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}{int(now % 1 * 1e6):06d}Z-{os.getpid()}"
+
+
+def _replace(src, dst):
+    tmp_path = f"{dst}.{os.getpid()}.tmp"
+    shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+def save_artifacts(model, schema, out_dir=MODEL_DIR, publish_path=MODEL_PATH):
+    """Write <name>-<version>.pkl, its flat forest export and .json schema to out_dir.
+
+    If publish_path is set they are copied there, the forest files last so they
+    are never older than the pickle they were exported from.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    model_path = os.path.join(out_dir, f"{MODEL_NAME}-{schema['version']}.pkl")
+    joblib.dump(model, model_path + ".tmp")
+    os.replace(model_path + ".tmp", model_path)
+    export_forest(model, model_path)
+    with open(schema_path(model_path), "w") as f:
+        json.dump(schema, f, indent=2)
+    if publish_path:
+        os.makedirs(os.path.dirname(publish_path) or ".", exist_ok=True)
+        _replace(schema_path(model_path), schema_path(publish_path))
+        _replace(model_path, publish_path)
+        for src, dst in zip(forest_paths(model_path)[::-1], forest_paths(publish_path)[::-1]):
+            _replace(src, dst)
+    return model_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the VendoWise supplier risk model.")
+    parser.add_argument("inputs", nargs="*", help="PO ledgers or feature tables (files or glob patterns)")
+    parser.add_argument("--config", default=CONFIG_PATH, help="thresholds used for labels")
+    parser.add_argument("--out-dir", default=MODEL_DIR, help="versioned artifact directory")
+    parser.add_argument("--publish", default=MODEL_PATH, help="served model path ('' to skip)")
+    parser.add_argument("--state", default=None, help="LedgerFeatures store prefix to resume from and update; pass only new ledgers")
+    parser.add_argument("--max-rows", type=int, default=DEFAULT_MAX_ROWS, help="subsample above this many rows")
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--min-leaf", type=int, default=1)
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--jobs", type=int, default=-1, help="training threads (default: all cores)")
+    parser.add_argument("--workers", type=int, default=None, help="ledger worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_ROWS, help="rows per chunk")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    thresholds = load_config(args.config)["thresholds"]
+    inputs = expand_inputs(args.inputs)
+
+    start = time.perf_counter()
+    table, seen = build_training_table(inputs, args.max_rows, args.workers, args.state, args.seed, args.chunksize)
+    feature_seconds = time.perf_counter() - start
+    model, y, label, train_seconds = train(table, thresholds, args.trees, args.jobs, args.min_leaf, args.max_depth, args.seed)
+    peak_mb, worker_peak_mb = peak_rss_mb("self"), peak_rss_mb("children")
+
+    schema = {
+        "version": model_version(),
+        "features": FEATURES,
+        "feature_dtype": "float32",
+        "label": label,
+        "thresholds": dict(thresholds),
+        "inputs": inputs,
+        "rows_seen": int(seen),
+        "training_rows": int(len(table)),
+        "high_risk_rows": int(y.sum()),
+        "params": {"n_estimators": args.trees, "min_samples_leaf": args.min_leaf,
+                   "max_depth": args.max_depth, "n_jobs": args.jobs, "random_state": args.seed},
+        "feature_seconds": round(feature_seconds, 3),
+        "train_seconds": round(train_seconds, 3),
+        "peak_rss_mb": None if peak_mb is None else round(peak_mb, 1),
+        "worker_peak_rss_mb": None if worker_peak_mb is None else round(worker_peak_mb, 1),
+        "sklearn": sklearn.__version__,
+    }
+    model_path = save_artifacts(model, schema, args.out_dir, args.publish)
+    print(f"✅ Model trained on {len(table):,} rows ({int(y.sum()):,} high risk) in "
+          f"{feature_seconds + train_seconds:.1f}s and saved as '{model_path}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+import numpy as np
+import pandas as pd
+
+from vendowise_risk_engine import delivery_delay_days
+from vendowise_store import read_dataset, write_dataset
+
+# ---------------------------
+# Delivery Aggregates
+# ---------------------------
+# Running sums and a whole-day delay histogram per key (vendor or item). A
+# batch of POs is folded in with one factorize plus np.add.at on the slots it
+# touches, so appending costs O(batch) regardless of how many keys exist, and
+# KPIs never rescan the PO history. The tables have spare rows and grow
+# geometrically, so new keys don't copy them on every batch. Delays outside
+# [DELAY_MIN, DELAY_MAX] land in the edge bins.
+SUM_FIELDS = ["po_count", "ordered_qty", "received_qty", "rejected_qty", "delay_days_sum", "delay_count"]
+DELAY_MIN = -30
+DELAY_MAX = 90
+DELAY_BINS = np.arange(DELAY_MIN, DELAY_MAX + 1)
+
+
+class DeliveryAggregates:
+    def __init__(self, key_column):
+        self.key_column = key_column
+        self._slot_of = {}  # key -> row slot, in insertion order
+        self._keys = None
+        self._sums = np.zeros((0, len(SUM_FIELDS)), dtype="float64")
+        self._hist = np.zeros((0, len(DELAY_BINS)), dtype="int64")
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    @property
+    def keys(self):
+        """Index of keys in slot order, rebuilt only after new keys arrived."""
+        if self._keys is None or len(self._keys) != len(self._slot_of):
+            self._keys = pd.Index(list(self._slot_of), dtype=object, name=self.key_column)
+        return self._keys
+
+    @property
+    def sums(self):
+        """(keys x SUM_FIELDS) running sums; a view of the used rows."""
+        return self._sums[:len(self)]
+
+    @property
+    def hist(self):
+        """(keys x DELAY_BINS) delay counts; a view of the used rows."""
+        return self._hist[:len(self)]
+
+    def _reserve(self, n):
+        """Make room for n keys, at least doubling the tables when they have to grow."""
+        capacity = len(self._sums)
+        if n <= capacity:
+            return
+        capacity = max(n, 2 * capacity, 64)
+        for name in ("_sums", "_hist"):
+            old = getattr(self, name)
+            grown = np.zeros((capacity, old.shape[1]), dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def _slots(self, batch_keys):
+        """Row slot of every batch key, growing the tables for keys never seen before."""
+        codes, uniques = pd.factorize(batch_keys, use_na_sentinel=True)
+        slot_of = self._slot_of
+        slots = np.fromiter((slot_of.setdefault(key, len(slot_of)) for key in uniques),
+                            dtype="int64", count=len(uniques))
+        self._reserve(len(slot_of))
+        valid = codes >= 0
+        return slots[codes[valid]], valid
+
+    def append(self, batch, delay=None):
+        """Fold a batch of vendor_data.csv-schema rows into the aggregates."""
+        if len(batch) == 0:
+            return self
+        if delay is None:
+            delay = delivery_delay_days(batch)
+        slots, valid = self._slots(batch[self.key_column].to_numpy(dtype=object))
+        delay = delay[valid]
+        has_delay = ~np.isnan(delay)
+
+        qty = {col: pd.to_numeric(batch[col], errors="coerce").fillna(0).to_numpy(dtype="float64")[valid]
+               for col in ["ordered_qty", "received_qty", "rejected_qty"]}
+        values = np.column_stack([np.ones(len(slots)), qty["ordered_qty"], qty["received_qty"],
+                                  qty["rejected_qty"], np.where(has_delay, delay, 0.0),
+                                  has_delay.astype("float64")])
+        np.add.at(self._sums, slots, values)
+
+        bins = np.clip(delay[has_delay], DELAY_MIN, DELAY_MAX).astype("int64") - DELAY_MIN
+        np.add.at(self._hist, (slots[has_delay], bins), 1)
+        return self
+
+    def merge(self, other):
+        """Add another aggregate's sums and histogram (e.g. one built by a worker process)."""
+        if len(other) == 0:
+            return self
+        slots, _ = self._slots(other.keys.to_numpy(dtype=object))
+        self.sums[slots] += other.sums
+        self.hist[slots] += other.hist
+        return self
+
+    def totals(self):
+        return pd.DataFrame(self.sums, index=self.keys, columns=SUM_FIELDS)
+
+    def on_time_rate(self, max_delay):
+        """Share of delivered POs with delay <= max_delay, read off the histogram."""
+        upto = int(np.clip(np.floor(max_delay), DELAY_MIN - 1, DELAY_MAX)) - DELAY_MIN + 1
+        on_time = self.hist[:, :upto].sum(axis=1)
+        count = self.hist.sum(axis=1)
+        return np.divide(on_time, count, out=np.full(len(count), np.nan), where=count > 0)
+
+    def delay_quantile(self, q):
+        cum = self.hist.cumsum(axis=1)
+        count = cum[:, -1]
+        idx = (cum < np.ceil(q * count)[:, None]).sum(axis=1).clip(max=len(DELAY_BINS) - 1)
+        return np.where(count > 0, DELAY_BINS[idx], np.nan)
+
+    def kpis(self, max_delay):
+        """Per-key KPI table: PO count, average/p90 delay, on-time and rejection rates (%)."""
+        totals = self.totals()
+        ordered = totals["ordered_qty"].where(totals["ordered_qty"] > 0)
+        return pd.DataFrame({
+            "po_count": totals["po_count"].astype("int64"),
+            "avg_delay_days": totals["delay_days_sum"] / totals["delay_count"].where(totals["delay_count"] > 0),
+            "p90_delay_days": self.delay_quantile(0.9),
+            "on_time_rate (%)": self.on_time_rate(max_delay) * 100,
+            "rejection_rate (%)": totals["rejected_qty"] / ordered * 100,
+        }, index=self.keys)
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def to_frame(self):
+        frame = self.totals()
+        hist = pd.DataFrame(self.hist, index=self.keys, columns=[f"delay_{d}" for d in DELAY_BINS])
+        return pd.concat([frame, hist], axis=1).reset_index()
+
+    @classmethod
+    def from_frame(cls, frame, key_column):
+        agg = cls(key_column)
+        agg._slot_of = {key: slot for slot, key in enumerate(frame[key_column].to_numpy(dtype=object))}
+        agg._sums = frame[SUM_FIELDS].to_numpy(dtype="float64", copy=True)
+        agg._hist = frame[[f"delay_{d}" for d in DELAY_BINS]].to_numpy(dtype="int64", copy=True)
+        return agg
+
+
+# ---------------------------
+# Time-bucketed Rollups
+# ---------------------------
+# Per-vendor daily sums plus a sparse delay histogram, keyed on the day a PO
+# was due (expected_delivery_date). The histogram is kept long, (vendor, day,
+# delay) -> count, so it only holds combinations that occurred. Weekly and
+# monthly rollups and rolling windows are re-bucketed from the daily state and
+# never touch PO rows; new POs are grouped per batch and queued (QueuedSums).
+ROLLUP_FIELDS = ["po_count", "ordered_qty", "rejected_qty", "delay_days_sum", "delay_count"]
+COMPACT_ROWS = 100_000
+ROLLUP_FREQS = {"Daily": "D", "Weekly": "W", "Monthly": "M"}
+EPOCH = pd.Timestamp("1970-01-01")
+
+
+class QueuedSums:
+    """A frame (or series) of sums keyed on its index, with added parts folded in lazily.
+
+    add() only queues a part. Queued parts are concatenated and grouped once,
+    when the table is read or once the queue is as large as the table, so
+    adding many batches stays linear instead of re-aligning the whole table
+    every time (DataFrame.add).
+    """
+
+    def __init__(self, table):
+        self._table = table
+        self._pending = []
+        self._pending_rows = 0
+
+    def add(self, part):
+        self._pending.append(part)
+        self._pending_rows += len(part)
+        if self._pending_rows >= max(len(self._table), COMPACT_ROWS):
+            self._compact()
+        return self
+
+    def _compact(self):
+        parts = ([] if self._table.empty else [self._table]) + self._pending
+        levels = list(range(parts[0].index.nlevels))
+        self._table = pd.concat(parts).groupby(level=levels, sort=False).sum()
+        self._pending, self._pending_rows = [], 0
+
+    @property
+    def table(self):
+        if self._pending:
+            self._compact()
+        return self._table
+
+
+def period_start_days(days, freq):
+    """Day number (since 1970-01-01) of the day/Monday/first of month each day falls in."""
+    days = np.asarray(days, dtype="int64")
+    if freq == "D":
+        return days
+    if freq == "W":
+        return days - (days + 3) % 7  # 1970-01-01 was a Thursday
+    if freq == "M":
+        months = days.astype("datetime64[D]").astype("datetime64[M]")
+        return months.astype("datetime64[D]").astype("int64")
+    raise ValueError(f"Unknown rollup frequency: {freq}")
+
+
+def rollup_kpis(sums, rows, delay, counts, max_delay):
+    """KPI columns for a frame of ROLLUP_FIELDS sums and its delay histogram in long form.
+
+    Histogram entry k adds counts[k] POs with delay[k] to row rows[k] of sums;
+    entries are sorted by row, then delay. p90 follows delay_quantile above.
+    """
+    n = len(sums)
+    total = np.bincount(rows, weights=counts, minlength=n)
+    cum = np.cumsum(counts)
+    starts = np.diff(rows, prepend=-1) != 0
+    cum = cum - np.maximum.accumulate(np.where(starts, cum - counts, 0))
+    reached = np.flatnonzero(cum >= np.ceil(0.9 * total[rows]))
+    first = reached[np.diff(rows[reached], prepend=-1) != 0]
+    p90 = np.full(n, np.nan)
+    p90[rows[first]] = delay[first]
+    on_time = np.bincount(rows, weights=counts * (delay <= max_delay), minlength=n)
+    return pd.DataFrame({
+        "po_count": sums["po_count"].astype("int64"),
+        "avg_delay_days": sums["delay_days_sum"] / sums["delay_count"].where(sums["delay_count"] > 0),
+        "p90_delay_days": p90,
+        "on_time_rate (%)": np.divide(on_time, total, out=np.full(n, np.nan), where=total > 0) * 100,
+        "rejection_rate (%)": sums["rejected_qty"] / sums["ordered_qty"].where(sums["ordered_qty"] > 0) * 100,
+    }, index=sums.index)
+
+
+class DeliveryRollups:
+    def __init__(self, key_column="vendor_name"):
+        self.key_column = key_column
+        self.daily = pd.DataFrame(columns=ROLLUP_FIELDS, dtype="float64",
+                                  index=pd.MultiIndex.from_arrays([[], []], names=[key_column, "day"]))
+        self.delays = pd.Series(dtype="int64", name="count",
+                                index=pd.MultiIndex.from_arrays([[], [], []], names=[key_column, "day", "delay"]))
+        self._buckets = {}  # (freq, by_key) -> re-bucketed state, dropped whenever POs are added
+
+    def __len__(self):
+        return len(self.daily)
+
+    @property
+    def daily(self):
+        """(key, day) -> ROLLUP_FIELDS sums."""
+        return self._daily.table
+
+    @daily.setter
+    def daily(self, frame):
+        self._daily = QueuedSums(frame)
+
+    @property
+    def delays(self):
+        """(key, day, delay) -> PO count."""
+        return self._delays.table
+
+    @delays.setter
+    def delays(self, series):
+        self._delays = QueuedSums(series)
+
+    def append(self, batch, delay=None):
+        """Fold a batch of vendor_data.csv-schema rows into the daily state."""
+        if len(batch) == 0:
+            return self
+        if delay is None:
+            delay = delivery_delay_days(batch)
+        due = pd.to_datetime(batch["expected_delivery_date"], errors="coerce")
+        day = (due - EPOCH).dt.days.to_numpy(dtype="float64")
+        keep = ~np.isnan(day) & batch[self.key_column].notna().to_numpy()
+        if not keep.any():
+            return self
+        keys = batch[self.key_column].to_numpy(dtype=object)[keep]
+        day, delay = day[keep].astype("int64"), delay[keep]
+        has_delay = ~np.isnan(delay)
+
+        qty = {col: pd.to_numeric(batch[col], errors="coerce").fillna(0).to_numpy(dtype="float64")[keep]
+               for col in ["ordered_qty", "rejected_qty"]}
+        parts = pd.DataFrame({
+            "po_count": np.ones(len(keys)),
+            "ordered_qty": qty["ordered_qty"],
+            "rejected_qty": qty["rejected_qty"],
+            "delay_days_sum": np.where(has_delay, delay, 0.0),
+            "delay_count": has_delay.astype("float64"),
+        })
+        daily = parts.groupby([keys, day], sort=False).sum()
+        daily.index = daily.index.set_names([self.key_column, "day"])
+        bins = np.clip(delay[has_delay], DELAY_MIN, DELAY_MAX).astype("int64")
+        delays = pd.Series(1, index=pd.MultiIndex.from_arrays([keys[has_delay], day[has_delay], bins]),
+                           dtype="int64").groupby(level=[0, 1, 2], sort=False).sum()
+        delays.index = delays.index.set_names([self.key_column, "day", "delay"])
+        return self._add(daily, delays)
+
+    def _add(self, daily, delays):
+        self._buckets = {}
+        self._daily.add(daily)
+        if len(delays):
+            self._delays.add(delays)
+        return self
+
+    def merge(self, other):
+        """Add another rollup state (e.g. one upload job's)."""
+        if other.daily.empty:
+            return self
+        return self._add(other.daily, other.delays)
+
+    def _bucketed(self, freq, by_key=True):
+        """(sums, long histogram) re-bucketed to freq; keyed on (key, period) or on period alone."""
+        cached = self._buckets.get((freq, by_key))
+        if cached is not None:
+            return cached
+        levels = [self.key_column, "period"] if by_key else ["period"]
+        daily_period = period_start_days(self.daily.index.get_level_values("day"), freq)
+        keys = [self.daily.index.get_level_values(self.key_column), daily_period][-len(levels):]
+        sums = self.daily.groupby(keys).sum()
+        sums.index = sums.index.set_names(levels)
+        delay_period = period_start_days(self.delays.index.get_level_values("day"), freq)
+        keys = [self.delays.index.get_level_values(self.key_column), delay_period][-len(levels):]
+        hist = self.delays.groupby(keys + [self.delays.index.get_level_values("delay")]).sum()
+        hist.index = hist.index.set_names(levels + ["delay"])
+        self._buckets[(freq, by_key)] = sums, hist
+        return sums, hist
+
+    @staticmethod
+    def _long(sums, hist):
+        """(rows, delay, counts) arrays of a long histogram aligned with the rows of sums."""
+        rows = sums.index.get_indexer(hist.index.droplevel("delay"))
+        return rows, hist.index.get_level_values("delay").to_numpy(dtype="int64"), hist.to_numpy(dtype="float64")
+
+    @staticmethod
+    def _with_dates(frame):
+        period = frame.index.get_level_values("period")
+        dates = EPOCH + pd.to_timedelta(np.asarray(period, dtype="int64"), unit="D")
+        if frame.index.nlevels == 1:
+            frame.index = pd.DatetimeIndex(dates, name="period")
+        else:
+            frame.index = frame.index.set_levels(
+                EPOCH + pd.to_timedelta(frame.index.levels[-1].to_numpy(dtype="int64"), unit="D"), level="period")
+        return frame
+
+    def rollup(self, freq, max_delay, by_key=True):
+        """KPIs per (vendor, period) or, with by_key=False, per period over all vendors.
+
+        Periods are labelled with their first day (Mondays for weekly rollups).
+        """
+        sums, hist = self._bucketed(freq, by_key)
+        return self._with_dates(rollup_kpis(sums, *self._long(sums, hist), max_delay))
+
+    def trend(self, freq, max_delay, window=4, key=None):
+        """Rolling-window KPIs over consecutive periods for one vendor (or all vendors when key is None).
+
+        Each point covers the `window` periods up to and including it; rates are
+        recomputed from the summed counts, not averaged.
+        """
+        sums, hist = self._bucketed(freq, by_key=key is not None)
+        if key is not None:
+            # masks rather than xs: a vendor with POs due but none delivered has sums but no histogram
+            sums = sums[sums.index.get_level_values(self.key_column) == key].droplevel(self.key_column)
+            hist = hist[hist.index.get_level_values(self.key_column) == key].droplevel(self.key_column)
+        periods = sums.index.to_numpy(dtype="int64")
+        grid = np.unique(period_start_days(np.arange(periods.min(), periods.max() + 1), freq)) if len(periods) \
+            else periods
+        # one series is short enough for a dense (periods x delay bins) histogram
+        rows, delay, counts = self._long(sums, hist)
+        dense = np.zeros((len(grid), len(DELAY_BINS)))
+        np.add.at(dense, (np.searchsorted(grid, periods)[rows], delay - DELAY_MIN), counts)
+        full = pd.DataFrame(0.0, index=pd.Index(grid, name="period"), columns=ROLLUP_FIELDS)
+        full.iloc[np.searchsorted(grid, periods)] = sums[ROLLUP_FIELDS].to_numpy()
+
+        rolled = full.rolling(window, min_periods=1).sum()
+        dense = pd.DataFrame(dense).rolling(window, min_periods=1).sum().to_numpy()
+        rows, bins = np.nonzero(dense)
+        return self._with_dates(rollup_kpis(rolled, rows, DELAY_BINS[bins], dense[rows, bins], max_delay))
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def to_frames(self):
+        return self.daily.reset_index(), self.delays.rename("count").reset_index()
+
+    @classmethod
+    def from_frames(cls, daily, delays, key_column):
+        rollups = cls(key_column)
+        rollups.daily = daily.set_index([key_column, "day"])
+        rollups.delays = delays.set_index([key_column, "day", "delay"])["count"]
+        return rollups
+
+
+class VendorAggregateStore:
+    """Per-vendor and per-item delivery aggregates plus per-vendor daily rollups, updated batch by batch."""
+
+    def __init__(self):
+        self.by_vendor = DeliveryAggregates("vendor_name")
+        self.by_item = DeliveryAggregates("item_code")
+        self.rollups = DeliveryRollups("vendor_name")
+
+    def append(self, batch):
+        delay = delivery_delay_days(batch)
+        self.by_vendor.append(batch, delay)
+        self.by_item.append(batch, delay)
+        self.rollups.append(batch, delay)
+        return self
+
+    def merge(self, other):
+        self.by_vendor.merge(other.by_vendor)
+        self.by_item.merge(other.by_item)
+        self.rollups.merge(other.rollups)
+        return self
+
+    def vendor_kpis(self, max_delay):
+        return self.by_vendor.kpis(max_delay)
+
+    def item_kpis(self, max_delay):
+        return self.by_item.kpis(max_delay)
+
+    def save(self, prefix):
+        write_dataset(self.by_vendor.to_frame(), f"{prefix}-vendor.arrow")
+        write_dataset(self.by_item.to_frame(), f"{prefix}-item.arrow")
+        daily, delays = self.rollups.to_frames()
+        write_dataset(daily, f"{prefix}-daily.arrow")
+        write_dataset(delays, f"{prefix}-delays.arrow")
+
+    @classmethod
+    def load(cls, prefix):
+        store = cls()
+        store.by_vendor = DeliveryAggregates.from_frame(read_dataset(f"{prefix}-vendor.arrow"), "vendor_name")
+        store.by_item = DeliveryAggregates.from_frame(read_dataset(f"{prefix}-item.arrow"), "item_code")
+        store.rollups = DeliveryRollups.from_frames(read_dataset(f"{prefix}-daily.arrow"),
+                                                    read_dataset(f"{prefix}-delays.arrow"), "vendor_name")
+        return store
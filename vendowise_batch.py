@@ -0,0 +1,182 @@
+"""Headless batch risk scoring.
+
+    python vendowise_batch.py exports/*.csv --out scored/ --workers 32
+
+Input files are split into parts of about PART_BYTES at line boundaries and
+every part is scored on its own worker process, so one large export keeps all
+workers busy. Rows get the same "Risk Bits"/"Risk Reasons" as the dashboards
+and are written to <out>/<path>_scored.csv, where <path> is the input's path
+relative to the inputs' common directory (so equal names in different
+directories don't collide). The per-vendor sums of all files are merged into
+<out>/vendor_summary.csv together with the supplier risk model's probability.
+No Streamlit code is imported.
+
+Parts are cut at newlines, so records must not contain quoted line breaks
+(true of the vendor_data.csv exports).
+"""
+import argparse
+import glob
+import io
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from vendowise_config import CONFIG_PATH, load_config
+from vendowise_ingest import DEFAULT_CHUNK_ROWS, combine_summaries, finalize_summary, iter_vendor_chunks, summarize_chunk
+from vendowise_model import MODEL_PATH, model_available, predict_features, supplier_features
+from vendowise_risk_engine import apply_risk_flags
+
+
+PART_BYTES = 64 * 1024 * 1024
+
+
+# ---------------------------
+# Parts
+# ---------------------------
+def file_parts(path, part_bytes=PART_BYTES):
+    """(start, end) byte ranges covering a CSV's body in pieces of about part_bytes."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        body_start = len(f.readline())
+    starts = range(body_start, size, part_bytes)
+    return [(start, min(start + part_bytes, size)) for start in starts] or [(body_start, body_start)]
+
+
+def read_part(path, start, end):
+    """The header plus every line that starts in [start, end), as a readable buffer."""
+    with open(path, "rb") as f:
+        header = f.readline()
+        # a line belongs to the part holding its first byte: finish the one
+        # running into start (a lone newline when a line starts exactly there)
+        f.seek(max(start - 1, 0))
+        f.readline()
+        body = f.read(max(end - f.tell(), 0))
+        if body and not body.endswith(b"\n"):
+            body += f.readline()
+    return io.BytesIO(header + body)
+
+
+def output_path(path, root, out_dir):
+    """<out_dir>/<path relative to root>_scored.csv, creating its directory."""
+    rel = os.path.relpath(os.path.abspath(path), root)
+    out_path = os.path.join(out_dir, os.path.splitext(rel)[0] + "_scored.csv")
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    return out_path
+
+
+def join_parts(part_paths, out_path):
+    """Concatenate scored parts in order into out_path (atomically) and remove them."""
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        for part_path in part_paths:
+            with open(part_path, "rb") as part:
+                shutil.copyfileobj(part, out)
+            os.remove(part_path)
+    os.replace(tmp_path, out_path)
+
+
+# ---------------------------
+# Worker
+# ---------------------------
+def score_part(path, start, end, part_path, config, header=True, chunksize=DEFAULT_CHUNK_ROWS):
+    """Score one part of a PO file chunk by chunk; returns (rows, per-vendor sums)."""
+    sums = None
+    rows = 0
+    with open(part_path, "w", newline="") as out:
+        for chunk in iter_vendor_chunks(read_part(path, start, end), chunksize):
+            apply_risk_flags(chunk, config)
+            sums = combine_summaries(sums, summarize_chunk(chunk, config, chunk["Risk Bits"].to_numpy()))
+            chunk.to_csv(out, index=False, header=header and rows == 0)
+            rows += len(chunk)
+    return rows, sums
+
+
+# ---------------------------
+# Vendor Summary
+# ---------------------------
+def add_model_scores(summary, model_path=MODEL_PATH):
+    """Append the model's high-risk probability, from the vendor totals via the model's feature definition."""
+    if not summary.empty and model_available(model_path):
+        features = supplier_features(summary["delay_days_sum"], summary["delay_count"],
+                                     summary["rejected_qty"], summary["ordered_qty"])
+        summary["model_risk_probability"] = predict_features(np.column_stack(features), model_path)
+    return summary
+
+
+def expand_inputs(patterns):
+    """Files matching the patterns, in order and without duplicates; raises when a pattern matches nothing."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+        if not matches:
+            raise FileNotFoundError(f"no files matched {pattern!r}")
+        paths.extend(matches)
+    return list(dict.fromkeys(paths))
+
+
+def run_batch(inputs, out_dir, config, workers=None, chunksize=DEFAULT_CHUNK_ROWS, model_path=MODEL_PATH,
+              part_bytes=PART_BYTES):
+    os.makedirs(out_dir, exist_ok=True)
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in inputs])
+    running = None
+    total_rows = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        pending = {}  # input path -> [output path, part paths, parts left, rows]
+        for path in inputs:
+            out_path = output_path(path, root, out_dir)
+            parts = file_parts(path, part_bytes)
+            part_paths = [f"{out_path}.part{i:05d}.tmp" for i in range(len(parts))]
+            pending[path] = [out_path, part_paths, len(parts), 0]
+            for i, ((start, end), part_path) in enumerate(zip(parts, part_paths)):
+                future = pool.submit(score_part, path, start, end, part_path, config, i == 0, chunksize)
+                futures[future] = path
+        for future in as_completed(futures):
+            path = futures[future]
+            rows, sums = future.result()
+            total_rows += rows
+            if sums is not None:
+                running = combine_summaries(running, sums)
+            state = pending[path]
+            state[2] -= 1
+            state[3] += rows
+            if state[2] == 0:
+                join_parts(state[1], state[0])
+                print(f"scored {path}: {state[3]:,} rows")
+
+    summary = add_model_scores(finalize_summary(running), model_path)
+    summary.to_csv(os.path.join(out_dir, "vendor_summary.csv"))
+    return total_rows, summary
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score vendor PO files without the dashboard.")
+    parser.add_argument("inputs", nargs="+", help="vendor_data.csv-schema files or glob patterns")
+    parser.add_argument("--out", default="scored", help="output directory (default: scored)")
+    parser.add_argument("--config", default=CONFIG_PATH, help="risk configuration JSON")
+    parser.add_argument("--model", default=MODEL_PATH, help="supplier risk model pickle")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_ROWS, help="rows per chunk")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    try:
+        inputs = expand_inputs(args.inputs)
+    except FileNotFoundError as exc:
+        parser.error(str(exc))
+
+    start = time.perf_counter()
+    rows, summary = run_batch(inputs, args.out, config,
+                              workers=args.workers, chunksize=args.chunksize, model_path=args.model)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {rows:,} rows, {len(summary):,} vendors in {elapsed:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark the data paths on seeded synthetic data.
+
+    python vendowise_benchmark.py --rows 10000 100000 1000000 --out bench.json
+
+Every stage is run once for wall time and once under tracemalloc for peak
+memory (the tracing pass is skipped with --no-memory). Throughput is reported
+in each stage's own unit: PO rows, vendors for chart prep and inference, and
+none for the one-off model load. Results are written as
+JSON so runs from different releases can be diffed or charted.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from vendowise_aggregates import VendorAggregateStore
+from vendowise_charts import top_n_counts, top_n_rates, top_n_values
+from vendowise_config import CONFIG_PATH, load_config
+from vendowise_ingest import read_typed_csv, stream_vendor_summary
+from vendowise_model import MODEL_PATH, model_available, predict_proba, read_model
+from vendowise_risk_engine import apply_risk_flags, reason_counts
+from vendowise_store import load_dataset
+from vendowise_synthetic import generate_inventory_data, generate_vendor_data
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+
+
+def measure(fn, memory=True):
+    """(seconds, peak MB or None, result) for one call of fn."""
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if memory:
+        del result
+        tracemalloc.start()
+        result = fn()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+    return seconds, peak_mb, result
+
+
+def bench_size(rows, config, workdir, seed=0, memory=True):
+    vendor_csv = os.path.join(workdir, f"vendor_{rows}.csv")
+    inventory_csv = os.path.join(workdir, f"inventory_{rows}.csv")
+    store_dir = os.path.join(workdir, "store")
+    generate_vendor_data(rows, seed=seed).to_csv(vendor_csv, index=False, date_format="%Y-%m-%d")
+    generate_inventory_data(rows, seed=seed).to_csv(inventory_csv, index=False, date_format="%Y-%m-%d")
+
+    load_dataset(vendor_csv, "vendor", store_dir)  # populate the store for the hit path
+    vendor = read_typed_csv(vendor_csv, "vendor")
+    scored = apply_risk_flags(vendor.copy(), config)
+    aggregates = VendorAggregateStore().append(vendor)
+    kpis = aggregates.vendor_kpis(config["thresholds"]["delay_days"])
+    totals = aggregates.by_vendor.totals()
+    counts = reason_counts(scored["Risk Bits"])
+    vendors = len(kpis)
+
+    # stage -> (fn, items processed, unit); unit None for one-off work with no throughput
+    stages = {
+        "ingest_vendor_csv": (lambda: read_typed_csv(vendor_csv, "vendor"), rows, "rows"),
+        "ingest_vendor_streaming": (lambda: stream_vendor_summary(vendor_csv, config), rows, "rows"),
+        "ingest_vendor_store_hit": (lambda: load_dataset(vendor_csv, "vendor", store_dir), rows, "rows"),
+        "ingest_inventory_csv": (lambda: read_typed_csv(inventory_csv, "inventory"), rows, "rows"),
+        "risk_flags": (lambda: apply_risk_flags(vendor.copy(), config), rows, "rows"),
+        "aggregation": (lambda: VendorAggregateStore().append(vendor), rows, "rows"),
+        # the dashboards' chart inputs: reason counts, pooled rejection rates, per-vendor delays
+        "chart_prep": (lambda: (top_n_counts(counts),
+                                top_n_rates(totals["rejected_qty"], totals["ordered_qty"], scale=100),
+                                top_n_values(kpis["avg_delay_days"])), vendors, "vendors"),
+    }
+    if model_available():
+        features = pd.DataFrame({"Avg_Delay_Days": kpis["avg_delay_days"],
+                                 "Rejection_Rate": kpis["rejection_rate (%)"] / 100})
+        stages["model_inference"] = (lambda: predict_proba(features), len(features), "vendors")
+        stages["model_cold_start"] = (lambda: read_model(MODEL_PATH), 1, None)
+
+    results = []
+    for stage, (fn, items, unit) in stages.items():
+        seconds, peak_mb, _ = measure(fn, memory)
+        results.append({
+            "stage": stage,
+            "rows": rows,
+            "items": items if unit else None,
+            "unit": unit,
+            "seconds": round(seconds, 6),
+            "items_per_sec": round(items / seconds, 1) if unit and seconds > 0 else None,
+            "peak_mb": None if peak_mb is None else round(peak_mb, 2),
+        })
+        done = f"{items:>11,} {unit}" if unit else " " * 12 + "once"
+        print(f"{stage:<26} {done:<20} {seconds:9.3f}s", file=sys.stderr)
+    return results
+
+
+def run_benchmarks(sizes, config, seed=0, memory=True):
+    with tempfile.TemporaryDirectory(prefix="vendowise-bench-") as workdir:
+        results = [r for rows in sizes for r in bench_size(rows, config, workdir, seed, memory)]
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+            "model_available": model_available(),
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark VendoWise data paths on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="dataset sizes to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", default=CONFIG_PATH, help="risk configuration JSON")
+    parser.add_argument("--out", default=None, help="JSON output path (default: stdout)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    report = run_benchmarks(args.rows, config, seed=args.seed, memory=not args.no_memory)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
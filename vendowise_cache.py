@@ -0,0 +1,173 @@
+import os
+
+import streamlit as st
+
+from vendowise_aggregates import VendorAggregateStore
+from vendowise_config import load_config
+from vendowise_index import DatasetIndex
+from vendowise_jobs import JobQueue, all_done, combined_aggregates, combined_frame
+from vendowise_risk_engine import apply_risk_flags, risk_config_key
+from vendowise_sensitivity import SensitivityIndex
+from vendowise_store import load_dataset, source_digest
+
+# ---------------------------
+# Cache Settings
+# ---------------------------
+# Eviction policy comes from the "cache" section of vendowise_config.json.
+# ttl_seconds / max_entries of null mean "no limit".
+cache_settings = load_config()["cache"]
+cache_data = st.cache_data(ttl=cache_settings["ttl_seconds"], max_entries=cache_settings["max_entries"],
+                           show_spinner=False)
+
+
+# ---------------------------
+# Content Keys
+# ---------------------------
+def content_key(source):
+    """Cache key and readable source for a file path or an uploaded file.
+
+    Paths are keyed on (path, mtime, size) so unchanged files are never re-read;
+    uploads are keyed on a digest of their bytes.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        stat = os.stat(source)
+        return f"{os.path.abspath(source)}:{stat.st_mtime_ns}:{stat.st_size}", source
+    data = source.getvalue()
+    return source_digest(data), data
+
+
+# ---------------------------
+# Cached Loaders
+# ---------------------------
+# The in-process cache sits on top of the on-disk columnar store, which is only
+# bypassed (CSV parse + typing) when the source content has never been seen.
+@cache_data
+def _load(key, _source, kind):
+    return load_dataset(_source, kind)
+
+
+@cache_data
+def _score(key, _source, config_key, _config):
+    return apply_risk_flags(_load(key, _source, "vendor"), _config)
+
+
+def read_csv_cached(source, kind):
+    """Typed vendor/inventory dataset, skipped entirely when the file content is unchanged."""
+    key, readable = content_key(source)
+    return _load(key, readable, kind)
+
+
+def load_vendor_csv(source):
+    return read_csv_cached(source, "vendor")
+
+
+def load_inventory_csv(source):
+    return read_csv_cached(source, "inventory")
+
+
+def load_scored_vendor_csv(source, config):
+    """Vendor CSV with risk flags, re-scored only when the data or the risk config changes."""
+    key, readable = content_key(source)
+    return _score(key, readable, risk_config_key(config), config)
+
+
+
+@st.cache_resource(show_spinner=False, max_entries=cache_settings["max_entries"])
+def _aggregates(key, _source):
+    return VendorAggregateStore().append(_load(key, _source, "vendor"))
+
+
+def load_vendor_aggregates(source):
+    """Per-vendor/per-item delivery aggregates, built once per dataset version and shared across sessions."""
+    key, readable = content_key(source)
+    return _aggregates(key, readable)
+
+
+@st.cache_resource(show_spinner=False, max_entries=cache_settings["max_entries"])
+def _sensitivity(key, _source):
+    return SensitivityIndex(_load(key, _source, "vendor"))
+
+
+def load_sensitivity_index(source):
+    """Threshold sensitivity index, sorted once per dataset version and shared across sessions."""
+    key, readable = content_key(source)
+    return _sensitivity(key, readable)
+
+
+@st.cache_resource(show_spinner=False, max_entries=cache_settings["max_entries"])
+def _index(key, _source):
+    return DatasetIndex(_load(key, _source, "vendor"))
+
+
+def load_dataset_index(source):
+    """Vendor/item/PO lookup index over the rows of load_vendor_csv(source), built once per dataset version."""
+    key, readable = content_key(source)
+    return _index(key, readable)
+
+
+# ---------------------------
+# Background Upload Jobs
+# ---------------------------
+# Results of finished upload jobs are cached on the jobs' keys, like files on
+# their content keys. All of these return None while a job is still running.
+@st.cache_resource(show_spinner=False)
+def job_queue():
+    """The background upload job pool, one per server process."""
+    return JobQueue()
+
+
+def _job_keys(jobs):
+    return tuple(job.key for job in jobs)
+
+
+@cache_data
+def _job_frame(keys, _jobs):
+    return combined_frame(_jobs)
+
+
+@cache_data
+def _scored_job_frame(keys, config_key, _jobs, _config):
+    frame = combined_frame(_jobs)
+    return None if frame is None else apply_risk_flags(frame, _config)
+
+
+@st.cache_resource(show_spinner=False, max_entries=cache_settings["max_entries"])
+def _job_aggregates(keys, _jobs):
+    return combined_aggregates(_jobs)
+
+
+@st.cache_resource(show_spinner=False, max_entries=cache_settings["max_entries"])
+def _job_sensitivity(keys, _jobs):
+    frame = combined_frame(_jobs)
+    return None if frame is None else SensitivityIndex(frame)
+
+
+@st.cache_resource(show_spinner=False, max_entries=cache_settings["max_entries"])
+def _job_index(keys, _jobs):
+    frame = _job_frame(keys, _jobs)
+    return None if frame is None else DatasetIndex(frame)
+
+
+def load_job_frame(jobs):
+    """Typed rows of all upload jobs that kept them."""
+    return _job_frame(_job_keys(jobs), jobs) if jobs and all_done(jobs) else None
+
+
+def load_scored_job_frame(jobs, config):
+    """Upload rows with risk flags, re-scored only when the uploads or the risk config change."""
+    if not jobs or not all_done(jobs):
+        return None
+    return _scored_job_frame(_job_keys(jobs), risk_config_key(config), jobs, config)
+
+
+def load_job_aggregates(jobs):
+    return _job_aggregates(_job_keys(jobs), jobs) if jobs and all_done(jobs) else None
+
+
+def load_job_index(jobs):
+    """Lookup index over the rows of load_job_frame(jobs)."""
+    return _job_index(_job_keys(jobs), jobs) if jobs and all_done(jobs) else None
+
+
+def load_job_sensitivity_index(jobs):
+    return _job_sensitivity(_job_keys(jobs), jobs) if jobs and all_done(jobs) else None
@@ -0,0 +1,73 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# Chart Data Prep
+# ---------------------------
+# Charts are drawn from per-category summaries, never from raw rows, and long
+# tails are folded into one "Other" bar, so figure cost depends on the number
+# of bars shown rather than on the number of POs.
+TOP_N = 20
+OTHER = "Other"
+
+
+def top_n_counts(counts, n=TOP_N):
+    """Largest n counts, the rest summed into "Other"."""
+    counts = counts.sort_values(ascending=False, kind="stable")
+    if len(counts) <= n:
+        return counts
+    return pd.concat([counts.iloc[:n], pd.Series({OTHER: counts.iloc[n:].sum()})])
+
+
+def top_n_rates(numerator, denominator, n=TOP_N, scale=1.0):
+    """Highest n pooled rates (numerator / denominator per category); "Other" pools the rest."""
+    numerator, denominator = numerator.align(denominator, fill_value=0)
+    rates = (numerator / denominator.where(denominator > 0) * scale).dropna()
+    rates = rates.sort_values(ascending=False, kind="stable")
+    if len(rates) <= n:
+        return rates
+    rest = rates.index[n:]
+    other = numerator[rest].sum() / denominator[rest].sum() * scale
+    return pd.concat([rates.iloc[:n], pd.Series({OTHER: other})])
+
+
+def top_n_values(values, n=TOP_N):
+    """Largest n per-category values; "Other" is the mean of the rest."""
+    values = values.dropna().sort_values(ascending=False, kind="stable")
+    if len(values) <= n:
+        return values
+    return pd.concat([values.iloc[:n], pd.Series({OTHER: values.iloc[n:].mean()})])
+
+
+# ---------------------------
+# Rendering
+# ---------------------------
+def render_bar_png(labels, values, title="", xlabel="", ylabel="", threshold=None, figsize=(8, 4), rotate=45):
+    """PNG bytes of a bar chart of pre-aggregated values, with an optional threshold line.
+
+    matplotlib and seaborn are imported here, on the first chart drawn, so
+    pages and processes that never draw one don't pay for them.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    with sns.axes_style("darkgrid"):
+        fig, ax = plt.subplots(figsize=figsize)
+    try:
+        ax.bar(np.arange(len(values)), values, color=sns.color_palette(n_colors=max(len(values), 1)))
+        ax.set_xticks(np.arange(len(values)), labels, rotation=rotate, ha="right" if rotate else "center")
+        if threshold is not None:
+            ax.axhline(y=threshold, color="red", linestyle="--", label="Threshold")
+            ax.legend()
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=100)
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
@@ -1,125 +1,155 @@
 import streamlit as st
-import pandas as pd
-import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
-import json
-import os
-from datetime import timedelta
+from vendowise_shell import login, sidebar_logo
 
-sns.set_style("darkgrid")
+st.set_page_config(page_title="VendoWise", layout="wide")
 
 # ---------------------------
-# Config Management
+# Authentication
 # ---------------------------
-config_path = "vendowise_config.json"
-default_config = {
-    "min_stock_buffer_days": 7,
-    "delay_days": 5,
-    "max_po_delay": 5,
-    "max_location_risk": 6,
-    "max_reject": 0.03,
-    "max_payment_terms": 45
-}
-
-if not os.path.exists(config_path):
-    config = default_config
-    with open(config_path, "w") as f:
-        json.dump(config, f, indent=4)
-
-try:
-    with open(config_path, "r") as f:
-        config = json.load(f)
-        for key in default_config:
-            if key not in config:
-                config[key] = default_config[key]
-except json.JSONDecodeError:
-    config = default_config
-with open(config_path, "w") as f:
-    json.dump(config, f, indent=4)
+# The login page renders before any data, model or plotting module is imported
+if not st.session_state.get("logged_in", False):
+    login()
+    st.stop()
+
+import pandas as pd
+import datetime
+from datetime import timedelta
+from vendowise_aggregates import ROLLUP_FREQS
+from vendowise_cache import (load_dataset_index, load_inventory_csv, load_job_aggregates, load_job_frame,
+                             load_job_index, load_vendor_aggregates, load_vendor_csv)
+from vendowise_charts import top_n_rates
+from vendowise_config import freeze, load_config, save_config
+from vendowise_diagnostics import stage, start_run
+from vendowise_exposure import supply_exposure
+from vendowise_forecast import HORIZONS_DAYS, stockout_forecast
+from vendowise_model import predict_one, risk_label
+from vendowise_scenarios import vendor_profile
+from vendowise_tables import ORANGE, RED
+from vendowise_widgets import (bar_chart, diagnostics_panel, paged_table, rerun, scenario_panel, submit_uploads,
+                              upload_status)
 
 # ---------------------------
-# Authentication
+# Config Management
 # ---------------------------
-def login():
-    st.title("🔐 VendoWise Login")
-    username = st.text_input("Username")
-    password = st.text_input("Password", type="password")
-    if st.button("Login"):
-        if username == "admin" and password == "vendowise123":
-            st.session_state["logged_in"] = True
-        else:
-            st.error("Invalid credentials")
-            st.stop()
+config = load_config().to_dict()
+thresholds = config["thresholds"]
+start_run("vendowise_combined_dashboard")
 
 # ---------------------------
 # Load Sample Data
 # ---------------------------
 def load_sample_inventory():
-    return pd.read_csv("inventory_data.csv")
+    return load_inventory_csv("inventory_data.csv")
 
 def load_sample_vendor():
-    return pd.read_csv("vendor_data.csv")
+    return load_vendor_csv("vendor_data.csv")
+
+def load_sample_vendor_aggregates():
+    return load_vendor_aggregates("vendor_data.csv")
+
+def load_sample_vendor_index():
+    return load_dataset_index("vendor_data.csv")
 
 # ---------------------------
 # Inventory Dashboard
 # ---------------------------
+def item_labels(inv_data):
+    """Item Code plus Item Description when the upload has one (it is optional)."""
+    return inv_data[[col for col in ["Item Code", "Item Description"] if col in inv_data.columns]]
+
 def inventory_dashboard(inv_data):
     st.title("📦 Inventory Risk Dashboard")
     today = pd.Timestamp(datetime.date.today())
-    inv_data["Next PO Delivery Date"] = pd.to_datetime(inv_data["Next PO Delivery Date"], errors="coerce")
-    inv_data["Expected Days Left"] = inv_data["Current Stock (Qty)"] / inv_data["Daily Avg Consumption"]
-    inv_data["Buffer Breach Risk"] = inv_data["Expected Days Left"] < config["min_stock_buffer_days"]
-    inv_data["Delay Impact"] = inv_data["Expected Delay (days)"] > config["delay_days"]
+    with stage("date coercion"):
+        inv_data["Next PO Delivery Date"] = pd.to_datetime(inv_data["Next PO Delivery Date"], errors="coerce")
+    with stage("inventory flags"):
+        inv_data["Expected Days Left"] = inv_data["Current Stock (Qty)"] / inv_data["Daily Avg Consumption"]
+        inv_data["Buffer Breach Risk"] = inv_data["Expected Days Left"] < thresholds["min_stock_buffer_days"]
+        inv_data["Delay Impact"] = inv_data["Expected Delay (days)"] > thresholds["delay_days"]
 
     st.subheader("📊 Inventory Risk Summary")
-    st.dataframe(inv_data.style.applymap(
-        lambda val: "background-color: red" if val is True else "",
-        subset=["Buffer Breach Risk", "Delay Impact"]
-    ))
+    paged_table(inv_data, key="inventory", highlight=[
+        ("Buffer Breach Risk", lambda s: s, RED),
+        ("Delay Impact", lambda s: s, RED),
+    ])
+
+    st.subheader("🔮 Stock-out Forecast")
+    with stage("stock-out forecast"):
+        forecast = stockout_forecast(inv_data, today=today)
+    at_risk = forecast[forecast["Earliest Breach Horizon (days)"].notna()]
+    st.caption(f"{len(at_risk):,} of {len(forecast):,} items drop below buffer within {HORIZONS_DAYS[-1]} days")
+    paged_table(item_labels(inv_data).join(at_risk, how="inner")
+                .sort_values("Buffer Breach Date"), key="forecast")
 
     st.subheader("📉 Inventory Risk Classification Chart")
     risk_counts = inv_data["Buffer Breach Risk"].value_counts().rename({True: "High Risk", False: "Low Risk"})
-    fig, ax = plt.subplots()
-    sns.barplot(x=risk_counts.index, y=risk_counts.values, ax=ax)
-    ax.set_ylabel("Number of Items")
-    ax.set_title("Inventory Risk Classification")
-    st.pyplot(fig)
+    bar_chart(risk_counts, title="Inventory Risk Classification", ylabel="Number of Items",
+              figsize=(6.4, 4.8), rotate=0)
 
 # ---------------------------
 # Vendor Dashboard with PO Simulation
 # ---------------------------
-def vendor_dashboard(vendor_data):
+def vendor_dashboard(vendor_data, vendor_aggregates, vendor_index):
     tab1, tab2 = st.tabs(["📈 Vendor Performance", "🧮 Vendor PO Risk Simulation"])
     today = pd.Timestamp(datetime.date.today())
 
     with tab1:
+        st.subheader("📋 Vendor KPIs")
+        with stage("vendor kpis"):
+            st.dataframe(vendor_aggregates.vendor_kpis(thresholds["delay_days"]).round(2))
+
+        st.subheader("📈 Delivery Trends")
+        freq_col, window_col, vendor_col = st.columns([1, 1, 2])
+        freq = freq_col.selectbox("Bucket", list(ROLLUP_FREQS), index=1, key="trend_freq")
+        window = window_col.number_input("Rolling window (buckets)", 1, 52, 4, key="trend_window")
+        trend_vendor = vendor_col.selectbox("Vendor", ["All vendors"] + vendor_index.vendor_names(), key="trend_vendor")
+        rollups = vendor_aggregates.rollups
+        with stage("delivery trends"):
+            trend = rollups.trend(ROLLUP_FREQS[freq], thresholds["delay_days"], window,
+                                  None if trend_vendor == "All vendors" else trend_vendor)
+        if trend.empty:
+            st.info("No POs with an expected delivery date to trend.")
+        else:
+            st.caption(f"Rolling {window}-bucket window, bucketed by expected delivery date")
+            rate_col, delay_col = st.columns(2)
+            rate_col.line_chart(trend[["on_time_rate (%)", "rejection_rate (%)"]], height=250)
+            delay_col.line_chart(trend[["avg_delay_days", "p90_delay_days"]], height=250)
+        with st.expander(f"{freq} rollup per vendor"):
+            with stage("vendor rollup"):
+                rollup = rollups.rollup(ROLLUP_FREQS[freq], thresholds["delay_days"]).round(2).reset_index()
+            paged_table(rollup, key="vendor_rollup")
+
+        st.subheader("🔎 Vendor Drill-down")
+        vendor = st.selectbox("Vendor", vendor_index.vendor_names(), key="drilldown_vendor")
+        with stage("vendor drill-down"):
+            vendor_rows = vendor_index.vendor_frame(vendor_data, vendor)
+        st.caption(f"{len(vendor_rows):,} POs")
+        paged_table(vendor_rows, key="vendor_detail")
+
         st.subheader("🚚 Vendor Delivery Performance")
-        vendor_data["expected_delivery_date"] = pd.to_datetime(vendor_data["expected_delivery_date"], errors="coerce")
-        vendor_data["actual_delivery_date"] = pd.to_datetime(vendor_data["actual_delivery_date"], errors="coerce")
-        vendor_data["delivery_delay"] = (vendor_data["actual_delivery_date"] - vendor_data["expected_delivery_date"]).dt.days
-        vendor_data["on_time"] = vendor_data["delivery_delay"] <= config["max_po_delay"]
-        st.dataframe(vendor_data.style.applymap(
-            lambda val: "background-color: red" if val is False else "",
-            subset=["on_time"]
-        ))
+        with stage("date coercion"):
+            vendor_data["expected_delivery_date"] = pd.to_datetime(vendor_data["expected_delivery_date"], errors="coerce")
+            vendor_data["actual_delivery_date"] = pd.to_datetime(vendor_data["actual_delivery_date"], errors="coerce")
+        with stage("delivery flags"):
+            vendor_data["delivery_delay"] = (vendor_data["actual_delivery_date"] - vendor_data["expected_delivery_date"]).dt.days
+            vendor_data["on_time"] = vendor_data["delivery_delay"] <= thresholds["delay_days"]
+        paged_table(vendor_data, key="vendor_delivery", highlight=[("on_time", lambda s: ~s, RED)])
 
         st.subheader("📦 Rejection & Freight Overview")
-        vendor_data["rejection_rate (%)"] = (vendor_data["rejected_qty"] / vendor_data["ordered_qty"]) * 100
-        st.dataframe(vendor_data[["vendor_name", "item_code", "rejection_rate (%)", "freight_cost", "location_risk"]]
-                     .style.applymap(
-                         lambda val: "background-color: orange" if isinstance(val, (int, float)) and val > config["max_location_risk"]
-                         else "", subset=["location_risk"]))
+        with stage("rejection rates"):
+            vendor_data["rejection_rate (%)"] = (vendor_data["rejected_qty"] / vendor_data["ordered_qty"]) * 100
+        paged_table(vendor_data[["vendor_name", "item_code", "rejection_rate (%)", "freight_cost", "location_risk"]],
+                    key="vendor_rejection",
+                    highlight=[("location_risk", lambda s: s > thresholds["max_location_risk"], ORANGE)])
 
         st.subheader("📊 Rejection Rate Chart")
-        fig, ax = plt.subplots(figsize=(8, 4))
-        sns.barplot(x="vendor_name", y="rejection_rate (%)", data=vendor_data, ax=ax)
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
+        totals = vendor_aggregates.by_vendor.totals()
+        bar_chart(top_n_rates(totals["rejected_qty"], totals["ordered_qty"], scale=100),
+                  xlabel="vendor_name", ylabel="rejection_rate (%)")
 
     with tab2:
         st.markdown("## ✏️ Vendor PO Risk Simulation")
-        supplier = st.selectbox("Select Supplier", vendor_data["vendor_name"].unique())
+        supplier = st.selectbox("Select Supplier", vendor_index.vendor_names())
         delay = st.number_input("Expected Delay (days)", 0, 30, 5)
         reject = st.number_input("Expected Rejection Rate (%)", 0.0, 20.0, 1.0) / 100
         payment = st.number_input("Payment Terms (days)", 15, 120, 45)
@@ -127,78 +157,115 @@ def vendor_dashboard(vendor_data):
         location = st.slider("Location Risk Index (0–10)", 0, 10, 5)
 
         risk = "High Risk 🔴" if (
-            delay > config["max_po_delay"] or
-            reject > config["max_reject"] or
-            payment > config["max_payment_terms"] or
-            stock < config["min_stock_buffer_days"] or
-            location > config["max_location_risk"]
+            delay > thresholds["delay_days"] or
+            reject > thresholds["rejection_rate"] or
+            payment > thresholds["payment_terms_days"] or
+            stock < thresholds["min_stock_buffer_days"] or
+            location > thresholds["max_location_risk"]
         ) else "Low Risk 🟢"
-st.success("Settings saved successfully.")
+        with stage("model"):
+            proba = predict_one(delay, reject)
+        if proba is None:
+            st.success(f"Predicted Risk for **{supplier}**: **{risk}**")
+        else:
+            st.success(f"Predicted Risk for **{supplier}**: **{risk_label(proba)}** (model probability {proba:.0%})")
+            st.caption(f"Threshold check: {risk}")
+
+        st.markdown("## 🧭 Portfolio What-If")
+        with stage("vendor profile"):
+            profile = vendor_profile(vendor_data)
+        scenario_panel(profile, config)
 
 # ---------------------------
-# Main App
+# Supply Risk Exposure
 # ---------------------------
-def main():
-    st.set_page_config(page_title="VendoWise", layout="wide")
-
-    if "logged_in" not in st.session_state:
-        st.session_state["logged_in"] = False
+def exposure_dashboard(inv_data, vendor_data):
+    st.title("🔗 Supply Risk Exposure")
+    today = pd.Timestamp(datetime.date.today())
+    with stage("exposure join"):
+        sku, vendors = supply_exposure(vendor_data, inv_data, config, today=today)
+    matched = sku["Suppliers"] > 0
+    if not matched.any():
+        st.info("No inventory Item Code matches a vendor item_code, so there is nothing to join.")
+        return
+    st.caption(f"{int(matched.sum()):,} of {len(sku):,} SKUs matched to "
+               f"{int((vendors['SKUs Supplied'] > 0).sum()):,} vendors · exposure = stock-out urgency × supplier risk")
 
-    if not st.session_state["logged_in"]:
-        login()
-        st.stop()
+    st.subheader("📦 SKU Exposure")
+    paged_table(item_labels(inv_data).join(sku).sort_values("Exposure", ascending=False),
+                key="sku_exposure", highlight=[("Exposure", lambda s: s >= 0.5, RED)])
 
-    # Sidebar Logo
-    try:
-        st.sidebar.image("Iniksa-TM.png", width=150)
-    except:
-        st.sidebar.markdown("**VendoWise**")
+    st.subheader("🏭 Vendor Exposure")
+    paged_table(vendors.reset_index(), key="vendor_exposure",
+                highlight=[("Vendor Risk", lambda s: s >= 0.5, ORANGE)])
+    exposed = vendors["Exposure"].head(10)
+    if exposed.gt(0).any():
+        bar_chart(exposed, title="Most Exposed Vendors", xlabel="vendor_name", ylabel="Exposure")
 
-    st.sidebar.title("Supplier Risk Intelligence Hub")
+# ---------------------------
+# Main App
+# ---------------------------
+sidebar_logo()
+st.sidebar.title("Supplier Risk Intelligence Hub")
 
-    st.sidebar.header("Threshold Configuration")
 with st.sidebar.expander("🔧 Threshold Configuration", expanded=False):
-    min_stock_buffer = st.slider("Min Stock Buffer (Days)", 0, 30, 7)
-    max_delivery_delay = st.slider("Max Acceptable Delivery Delay (Days)", 0, 15, 5)
-    max_po_delay = st.slider("Max PO Delay", 0, 30, 5)
-    max_location_risk = st.slider("Max Location Risk Score", 0, 10, 6)
-    max_rejection_rate = st.slider("Max Rejection Rate (%)", 0.0, 20.0, 3.0)
-    max_payment_terms = st.slider("Max Payment Terms (Days)", 15, 120, 45)
+    thresholds["min_stock_buffer_days"] = st.slider("Min Stock Buffer (Days)", 0, 30, thresholds["min_stock_buffer_days"])
+    thresholds["delay_days"] = st.slider("Max Acceptable Delivery Delay (Days)", 0, 30, thresholds["delay_days"])
+    thresholds["max_location_risk"] = st.slider("Max Location Risk Score", 0, 10, thresholds["max_location_risk"])
+    thresholds["rejection_rate"] = st.slider("Max Rejection Rate (%)", 0.0, 20.0, float(thresholds["rejection_rate"] * 100)) / 100
+    thresholds["payment_terms_days"] = st.slider("Max Payment Terms (Days)", 15, 120, thresholds["payment_terms_days"])
 
 with st.sidebar.expander("📥 Data Input Mode", expanded=False):
     data_input_mode = st.radio("Choose data input mode", ["Sample Data", "Upload Your File"], index=0)
-    st.button("Save Settings")
+    if st.button("Save Settings"):
+        save_config(config)
+        st.success("Settings saved successfully.")
 
-with open(config_path, "w") as f:
-    json.dump(config, f, indent=4)
-st.success("Settings saved successfully.")
+# the engines get an immutable snapshot of the edited settings
+config = freeze(config)
+thresholds = config["thresholds"]
 
 st.sidebar.title("Navigation")
-choice = st.sidebar.radio("Go to", ["Inventory Dashboard", "Vendor Dashboard", "Logout"])
+choice = st.sidebar.radio("Go to", ["Inventory Dashboard", "Vendor Dashboard", "Supply Exposure", "Logout"])
 
 # Load data
 if data_input_mode == "Sample Data":
-    inventory_data = load_sample_inventory()
-    vendor_data = load_sample_vendor()
+    with stage("load data"):
+        inventory_data = load_sample_inventory()
+        vendor_data = load_sample_vendor()
+        vendor_aggregates = load_sample_vendor_aggregates()
+        vendor_index = load_sample_vendor_index()
 else:
-    inv_file = st.sidebar.file_uploader("Upload Inventory CSV", type=["csv"])
-    ven_file = st.sidebar.file_uploader("Upload Vendor CSV", type=["csv"])
-    inventory_data = pd.read_csv(inv_file) if inv_file else None
-    vendor_data = pd.read_csv(ven_file) if ven_file else None
-
-    if choice == "Inventory Dashboard":
-        if inventory_data is not None:
-            inventory_dashboard(inventory_data)
-        else:
-            st.warning("Upload or select sample inventory data.")
-    elif choice == "Vendor Dashboard":
-        if vendor_data is not None:
-            vendor_dashboard(vendor_data)
-        else:
-            st.warning("Upload or select sample vendor data.")
-    elif choice == "Logout":
-        st.session_state["logged_in"] = False
-        st.experimental_rerun()
+    # Uploads are parsed on the background job pool; several files per kind are combined
+    inv_files = st.sidebar.file_uploader("Upload Inventory CSV", type=["csv"], accept_multiple_files=True)
+    ven_files = st.sidebar.file_uploader("Upload Vendor CSV", type=["csv"], accept_multiple_files=True)
+    with stage("upload jobs"):
+        inv_jobs = submit_uploads(inv_files, "inventory")
+        ven_jobs = submit_uploads(ven_files, "vendor")
+        upload_status(inv_jobs + ven_jobs)
+    with stage("load data"):
+        inventory_data = load_job_frame(inv_jobs)
+        vendor_data = load_job_frame(ven_jobs)
+        vendor_aggregates = load_job_aggregates(ven_jobs)
+        vendor_index = load_job_index(ven_jobs)
+
+if choice == "Inventory Dashboard":
+    if inventory_data is not None:
+        inventory_dashboard(inventory_data)
+    else:
+        st.warning("Upload or select sample inventory data.")
+elif choice == "Vendor Dashboard":
+    if vendor_data is not None:
+        vendor_dashboard(vendor_data, vendor_aggregates, vendor_index)
+    else:
+        st.warning("Upload or select sample vendor data.")
+elif choice == "Supply Exposure":
+    if inventory_data is not None and vendor_data is not None:
+        exposure_dashboard(inventory_data, vendor_data)
+    else:
+        st.warning("Upload or select both inventory and vendor data.")
+elif choice == "Logout":
+    st.session_state["logged_in"] = False
+    rerun()
 
-if __name__ == "__main__":
-    main()
+diagnostics_panel()
@@ -0,0 +1,200 @@
+import copy
+import hashlib
+import json
+import math
+import os
+import threading
+from collections.abc import Mapping
+
+# ---------------------------
+# Shared Config Service
+# ---------------------------
+# Every script and engine reads vendowise_config.json through load_config().
+# The parsed file is cached per process and only re-read when its mtime/size
+# change (and only re-parsed when its content hash changes). Writes go to a
+# temp file that is atomically renamed over the config, so concurrent sessions
+# never see a half-written file.
+CONFIG_PATH = "vendowise_config.json"
+DEFAULT_CONFIG = {
+    "use_rejected_qty": True,
+    "use_freight_cost": True,
+    "use_payment_terms": True,
+    "use_stock_buffer": True,
+    "use_location_risk": True,
+    "use_partial_delivery": False,
+    "thresholds": {
+        "delay_days": 5,
+        "rejection_rate": 0.05,
+        "payment_terms_days": 60,
+        "min_stock_buffer_days": 7,
+        "max_location_risk": 5
+    },
+    "cache": {
+        "ttl_seconds": 3600,
+        "max_entries": 16
+    },
+    "ingest": {
+        "streaming_threshold_mb": 50
+    },
+    "diagnostics": {
+        "enabled": False,
+        "trace_memory": True,
+        "log_path": "vendowise_metrics.jsonl"
+    }
+}
+
+# (section, key) settings where null is meaningful ("no limit") rather than invalid
+NULLABLE_KEYS = {("cache", "ttl_seconds"), ("cache", "max_entries")}
+
+# Flat keys written by older versions of vendowise_combined_dashboard.py
+LEGACY_THRESHOLD_KEYS = {
+    "delay_days": "delay_days",
+    "max_po_delay": "delay_days",
+    "max_reject": "rejection_rate",
+    "max_payment_terms": "payment_terms_days",
+    "min_stock_buffer_days": "min_stock_buffer_days",
+    "max_location_risk": "max_location_risk",
+}
+
+_lock = threading.Lock()
+_cache = {}  # path -> (mtime_ns, size), content digest, snapshot
+
+
+# ---------------------------
+# Immutable Snapshot
+# ---------------------------
+class ConfigSnapshot(Mapping):
+    """Read-only, hashable view of a validated config.
+
+    Equal configs hash equal, so a snapshot (or its .key digest) can be used
+    directly as a cache key by the risk engines.
+    """
+
+    def __init__(self, data):
+        self._data = {k: ConfigSnapshot(v) if isinstance(v, dict) else v for k, v in data.items()}
+        self._json = json.dumps(self.to_dict(), sort_keys=True)
+        self.key = hashlib.blake2b(self._json.encode(), digest_size=16).hexdigest()
+
+    def __getitem__(self, name):
+        return self._data[name]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        if isinstance(other, ConfigSnapshot):
+            return self.key == other.key
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ConfigSnapshot({self._json})"
+
+    def to_dict(self):
+        """Mutable deep copy, e.g. for sidebar widgets to edit before save_config()."""
+        return {k: v.to_dict() if isinstance(v, ConfigSnapshot) else copy.deepcopy(v) for k, v in self._data.items()}
+
+
+# ---------------------------
+# Validation
+# ---------------------------
+def _coerce(value, default, nullable=False):
+    """value converted to default's type; default when it can't be (or isn't a finite number)."""
+    if value is None:
+        return None if nullable else default
+    try:
+        if isinstance(default, bool):
+            return value if isinstance(value, bool) else default
+        if isinstance(default, (int, float)):
+            number = float(value)
+            if not math.isfinite(number):
+                return default
+            if isinstance(default, int):
+                return int(number) if number == int(number) else number
+            return number
+    except (TypeError, ValueError):
+        return default
+    return value
+
+
+def validate_config(raw):
+    """Config dict in the nested schema: legacy flat keys migrated, types checked, gaps defaulted.
+
+    Unknown keys are kept so older and newer scripts can share one file.
+    """
+    raw = raw if isinstance(raw, dict) else {}
+    config = {k: v for k, v in raw.items() if k not in LEGACY_THRESHOLD_KEYS}
+    thresholds = dict(raw.get("thresholds") or {})
+    for legacy, key in LEGACY_THRESHOLD_KEYS.items():
+        if legacy in raw and key not in thresholds:
+            thresholds[key] = raw[legacy]
+    config["thresholds"] = thresholds
+
+    for key, default in DEFAULT_CONFIG.items():
+        if isinstance(default, dict):
+            section = config.get(key) if isinstance(config.get(key), dict) else {}
+            config[key] = {**section, **{k: _coerce(section[k], d, (key, k) in NULLABLE_KEYS) if k in section else d
+                                         for k, d in default.items()}}
+        else:
+            config[key] = _coerce(config[key], default) if key in config else default
+    return config
+
+
+def freeze(config):
+    """Validated immutable snapshot of a config dict (e.g. after sidebar edits)."""
+    if isinstance(config, ConfigSnapshot):
+        return config
+    return ConfigSnapshot(validate_config(config))
+
+
+# ---------------------------
+# Load / Save
+# ---------------------------
+def _write_atomic(path, config):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(config, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+def load_config(path=CONFIG_PATH):
+    """Current config snapshot; the file is only re-read when it has changed on disk."""
+    with _lock:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            _write_atomic(path, DEFAULT_CONFIG)
+            stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = _cache.get(path)
+        if cached and cached[0] == signature:
+            return cached[2]
+
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        if cached and cached[1] == digest:
+            _cache[path] = (signature, digest, cached[2])
+            return cached[2]
+
+        try:
+            raw = json.loads(content)
+        except json.JSONDecodeError:
+            raw = {}
+        snapshot = freeze(raw)
+        _cache[path] = (signature, digest, snapshot)
+        return snapshot
+
+
+def save_config(config, path=CONFIG_PATH):
+    """Validate and atomically write config; returns the new snapshot."""
+    snapshot = freeze(config)
+    with _lock:
+        _write_atomic(path, snapshot.to_dict())
+        _cache.pop(path, None)
+    return load_config(path)
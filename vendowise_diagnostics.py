@@ -0,0 +1,122 @@
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from vendowise_config import load_config
+
+# ---------------------------
+# Stage Instrumentation
+# ---------------------------
+# Dashboards call start_run() at the top of a script run, wrap hot paths in
+# `with stage("..."):` and call finish_run() at the end. When diagnostics are
+# off, stage() hands back one shared no-op context manager, so instrumented
+# code pays a thread-local lookup and nothing else.
+#
+# Enabled by the "diagnostics" config section or VENDOWISE_DIAGNOSTICS=1/0.
+# Memory figures come from tracemalloc, which is process-wide: with several
+# sessions running at once they include the other sessions' allocations. It
+# slows every allocation, so tracing started here is stopped again by the
+# first run after diagnostics (or memory tracing) are switched off.
+#
+# Runs that end early must still call finish_run(); the dashboards do that
+# through vendowise_widgets.stop()/rerun() instead of st.stop()/st.rerun().
+DIAGNOSTICS_ENV = "VENDOWISE_DIAGNOSTICS"
+MB = 1024 ** 2
+
+_NOOP = contextlib.nullcontext()
+_local = threading.local()
+_log_lock = threading.Lock()
+_tracing_lock = threading.Lock()
+_started_tracing = False  # whether tracemalloc was started by us (and may be stopped by us)
+
+
+def diagnostics_settings():
+    section = load_config()["diagnostics"]
+    env = os.environ.get(DIAGNOSTICS_ENV)
+    enabled = section["enabled"] if env is None else env.lower() not in ("", "0", "false", "off")
+    return enabled, section["trace_memory"], section["log_path"]
+
+
+def start_run(script):
+    """Begin collecting stage records for this script run (a no-op when diagnostics are off)."""
+    enabled, trace_memory, log_path = diagnostics_settings()
+    _set_tracing(enabled and trace_memory)
+    if not enabled:
+        _local.run = None
+        return
+    _local.run = {
+        "script": script,
+        "trace_memory": trace_memory,
+        "log_path": log_path,
+        "started": time.perf_counter(),
+        "depth": 0,
+        "records": [],
+    }
+
+
+def _set_tracing(on):
+    """Start tracemalloc, or stop it if we were the ones who started it."""
+    global _started_tracing
+    with _tracing_lock:
+        if on and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        elif not on and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def enabled():
+    return getattr(_local, "run", None) is not None
+
+
+@contextlib.contextmanager
+def _timed(run, name):
+    tracing = run["trace_memory"] and tracemalloc.is_tracing()
+    top_level = run["depth"] == 0
+    if tracing:
+        before = tracemalloc.get_traced_memory()[0]
+        if top_level:
+            tracemalloc.reset_peak()
+    run["depth"] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record = {"stage": name, "seconds": round(time.perf_counter() - start, 6), "depth": run["depth"] - 1}
+        run["depth"] -= 1
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            record["mem_delta_mb"] = round((current - before) / MB, 3)
+            # nested stages share their parent's peak window
+            record["peak_mb"] = round((peak - before) / MB, 3) if top_level else None
+        run["records"].append(record)
+
+
+def stage(name):
+    """Context manager timing one stage of the current run."""
+    run = getattr(_local, "run", None)
+    return _NOOP if run is None else _timed(run, name)
+
+
+def finish_run():
+    """Stage records of the current run, appended to the metrics log as JSON lines; [] when off."""
+    run = getattr(_local, "run", None)
+    _local.run = None
+    if run is None:
+        return []
+    records = run["records"]
+    total = time.perf_counter() - run["started"]
+    records.append({"stage": "total", "seconds": round(total, 6), "depth": 0})
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    lines = "".join(json.dumps({"ts": stamp, "script": run["script"], "pid": os.getpid(), **record}) + "\n"
+                    for record in records)
+    try:
+        with _log_lock, open(run["log_path"], "a") as f:
+            f.write(lines)
+    except OSError:
+        pass
+    return records
@@ -1,53 +1,24 @@
-
 import streamlit as st
-import pandas as pd
-import json
-import os
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# ----------------- PASSWORD PROTECTION -----------------
-def check_password():
-    def password_entered():
-        if st.session_state["password"] == "vendowise123":
-            st.session_state["password_correct"] = True
-        else:
-            st.session_state["password_correct"] = False
-
-    if "password_correct" not in st.session_state:
-        st.text_input("Enter password", type="password", on_change=password_entered, key="password")
-        st.stop()
-    elif not st.session_state["password_correct"]:
-        st.text_input("Enter password", type="password", on_change=password_entered, key="password")
-        st.error("😕 Password incorrect")
-        st.stop()
+from vendowise_shell import check_password
 
 check_password()
-# -------------------------------------------------------
-
-
-# Load default config or from file
-default_config = {
-    "use_rejected_qty": True,
-    "use_freight_cost": True,
-    "use_payment_terms": True,
-    "use_stock_buffer": True,
-    "use_location_risk": True,
-    "use_partial_delivery": False,
-    "thresholds": {
-        "delay_days": 5,
-        "rejection_rate": 0.05,
-        "payment_terms_days": 60,
-        "min_stock_buffer_days": 7,
-        "max_location_risk": 5
-    }
-}
-config_file = "vendowise_config.json"
-if os.path.exists(config_file):
-    with open(config_file, "r") as f:
-        config = json.load(f)
-else:
-    config = default_config
+
+# Data and plotting modules are only imported once the password check has passed
+from vendowise_cache import load_job_sensitivity_index, load_scored_job_frame
+from vendowise_config import freeze, load_config, save_config
+from vendowise_diagnostics import stage, start_run
+from vendowise_ingest import streaming_threshold_bytes, summarize_chunk, summary_reason_counts
+from vendowise_jobs import all_done, combined_summary
+from vendowise_risk_engine import reason_counts
+from vendowise_tables import ORANGE
+from vendowise_widgets import (bar_chart, diagnostics_panel, paged_table, sensitivity_panel, submit_uploads,
+                               upload_status)
+
+start_run("vendowise_dynamic_risk_chart_protected")
+
+
+# Load config (validated, cached per process)
+config = load_config().to_dict()
 
 # Sidebar - Configurable options
 st.sidebar.header("Risk Factors Configuration")
@@ -65,54 +36,54 @@ config["thresholds"]["rejection_rate"] = st.sidebar.slider("Max Rejection Rate",
 config["thresholds"]["payment_terms_days"] = st.sidebar.slider("Max Payment Terms (days)", 15, 120, config["thresholds"]["payment_terms_days"])
 config["thresholds"]["min_stock_buffer_days"] = st.sidebar.slider("Min Stock Buffer (days)", 0, 30, config["thresholds"]["min_stock_buffer_days"])
 config["thresholds"]["max_location_risk"] = st.sidebar.slider("Max Location Risk", 0, 10, config["thresholds"]["max_location_risk"])
+# the engines get an immutable snapshot of the edited settings
+config = freeze(config)
 
 # Save config button
 if st.sidebar.button("💾 Save Configuration"):
-    with open(config_file, "w") as f:
-        json.dump(config, f, indent=4)
+    save_config(config)
     st.sidebar.success("Configuration saved!")
 
 # Main view
 st.title("📊 VendoWise Supplier Risk Evaluator")
 
-# Upload vendor data
-uploaded_file = st.file_uploader("Upload vendor_data.csv", type=["csv"])
-if uploaded_file:
-    df = pd.read_csv(uploaded_file)
+# Upload vendor data: parsed and scored on the background job pool
+uploaded_files = st.file_uploader("Upload vendor_data.csv", type=["csv"], accept_multiple_files=True)
+with stage("upload jobs"):
+    jobs = submit_uploads(uploaded_files, "vendor", config, max_row_bytes=streaming_threshold_bytes(config))
+    upload_status(jobs, partial=True)
+
+with stage("risk flags"):
+    df = load_scored_job_frame(jobs, config)
+streamed = [job for job in jobs if not job.keep_rows]
+chart_data = None
+if streamed and all_done(jobs):
+    st.info("Large file detected: scored in streaming mode, showing the per-vendor summary.")
+    with stage("vendor summary"):
+        row_sums = None if df is None else summarize_chunk(df, config, df["Risk Bits"].to_numpy())
+        summary = combined_summary(streamed, row_sums)
+    if summary is not None:
+        paged_table(summary.reset_index(), key="summary")
+
+        st.subheader("📈 Risk Summary Chart")
+        chart_data = summary_reason_counts(summary)
+elif df is not None:
     st.write("Uploaded Data Preview", df.head())
 
-    def calculate_flags(row):
-        delay = (pd.to_datetime(row["actual_delivery_date"]) - pd.to_datetime(row["expected_delivery_date"])).days
-        flags = []
-        if delay > config["thresholds"]["delay_days"]:
-            flags.append("Delay")
-        if config["use_rejected_qty"]:
-            rejection = row["rejected_qty"] / row["received_qty"] if row["received_qty"] else 0
-            if rejection > config["thresholds"]["rejection_rate"]:
-                flags.append("Rejection")
-        if config["use_payment_terms"] and row["payment_terms_days"] > config["thresholds"]["payment_terms_days"]:
-            flags.append("Payment Terms")
-        if config["use_stock_buffer"] and row["stock_buffer_days"] < config["thresholds"]["min_stock_buffer_days"]:
-            flags.append("Low Stock Buffer")
-        if config["use_location_risk"] and row["location_risk"] > config["thresholds"]["max_location_risk"]:
-            flags.append("Location Risk")
-        if config["use_partial_delivery"] and row["received_qty"] < row["ordered_qty"]:
-            flags.append("Partial Delivery")
-        return flags
-
-    df["Risk Reasons"] = df.apply(calculate_flags, axis=1)
-    df["Risk Level"] = df["Risk Reasons"].apply(lambda x: "High Risk 🔴 (" + ", ".join(x) + ")" if x else "Low Risk 🟢")
-    st.dataframe(df)
+    with stage("risk level labels"):
+        df["Risk Level"] = df["Risk Reasons"].cat.rename_categories(
+            lambda x: "High Risk 🔴 (" + x + ")" if x else "Low Risk 🟢")
+    paged_table(df, key="risk", highlight=[("Risk Level", lambda s: s != "Low Risk 🟢", ORANGE)])
 
     # Risk summary chart
     st.subheader("📈 Risk Summary Chart")
-    all_flags = df["Risk Reasons"].explode().dropna()
-    if not all_flags.empty:
-        chart_data = all_flags.value_counts()
-        fig, ax = plt.subplots()
-        sns.barplot(x=chart_data.index, y=chart_data.values, ax=ax)
-        ax.set_ylabel("Count")
-        ax.set_xlabel("Risk Reason")
-        ax.set_title("Frequency of Risk Reasons")
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
+    chart_data = reason_counts(df["Risk Bits"])
+
+if chart_data is not None and not chart_data.empty:
+    bar_chart(chart_data, title="Frequency of Risk Reasons", xlabel="Risk Reason", ylabel="Count", figsize=(6.4, 4.8))
+
+if df is not None and not streamed:
+    with st.expander("📐 Threshold Sensitivity"), stage("sensitivity"):
+        sensitivity_panel(load_job_sensitivity_index(jobs), config)
+
+diagnostics_panel()
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from vendowise_forecast import HORIZONS_DAYS, stockout_forecast
+from vendowise_scenarios import evaluate_scenarios, scenario_grid, vendor_profile
+
+# ---------------------------
+# Supply Risk Exposure
+# ---------------------------
+# Vendor POs and the inventory list meet on item code. Both sides are reduced
+# to integer codes first: vendors and items are categorical codes of the PO
+# table, and every SKU is mapped to its item code with one hash probe
+# (Index.get_indexer). Everything after that is bincounts over
+# (item, vendor) pairs, so nothing is ever joined row by row.
+#
+# Vendor risk:      model probability of the vendor's profile, or 1/0 for
+#                   "any enabled rule fires" when no model is available
+# Supplier risk:    per SKU, vendor risk weighted by each vendor's share of
+#                   the item's ordered quantity
+# Urgency:          1 when the SKU is below buffer today, falling linearly to
+#                   0 at the last forecast horizon
+# Exposure:         urgency x supplier risk per SKU; per vendor, the sum over
+#                   its SKUs of share x urgency x its own risk
+URGENCY_HORIZON_DAYS = HORIZONS_DAYS[-1]
+
+
+def _codes(col):
+    """(codes, labels) of a column; categorical columns reuse their codes instead of hashing again."""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return col.cat.codes.to_numpy(dtype="int64"), pd.Index(col.cat.categories, dtype=object)
+    codes, labels = pd.factorize(col)
+    return codes.astype("int64"), pd.Index(labels, dtype=object)
+
+
+def vendor_risk(vendor_df, config, vendor_column="vendor_name"):
+    """Risk score in [0, 1] per vendor, from the baseline column of the scenario engine."""
+    profile = vendor_profile(vendor_df, vendor_column)
+    matrix = evaluate_scenarios(profile, scenario_grid(), config)
+    proba = matrix.proba[:, 0].astype("float64")
+    return pd.Series(np.where(np.isnan(proba), matrix.flagged()[:, 0], proba), index=profile.index,
+                     name="Vendor Risk")
+
+
+def stockout_urgency(inv, today=None, horizon=URGENCY_HORIZON_DAYS):
+    """Per-SKU urgency in [0, 1] from the projected buffer breach date (0 when it never breaches)."""
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+    breach = stockout_forecast(inv, today=today)["Buffer Breach Date"]
+    days = (breach - today).dt.days.to_numpy(dtype="float64", na_value=np.nan)
+    return np.where(np.isnan(days), 0.0, np.clip(1.0 - days / horizon, 0.0, 1.0))
+
+
+def supply_exposure(vendor_df, inv, config, today=None, vendor_column="vendor_name"):
+    """(per-SKU exposure indexed like inv, per-vendor exposure indexed by vendor)."""
+    vendor_codes, vendors = _codes(vendor_df[vendor_column])
+    item_codes, items = _codes(vendor_df["item_code"])
+    qty = pd.to_numeric(vendor_df["ordered_qty"], errors="coerce").fillna(0).to_numpy(dtype="float64")
+    n_vendors, n_items = len(vendors), len(items)
+
+    # (item, vendor) pairs with their ordered quantity and share of the item
+    known = (vendor_codes >= 0) & (item_codes >= 0)
+    pair_keys, pair_inverse = np.unique(item_codes[known] * n_vendors + vendor_codes[known], return_inverse=True)
+    pair_qty = np.bincount(pair_inverse.ravel(), weights=qty[known], minlength=len(pair_keys))
+    pair_item, pair_vendor = np.divmod(pair_keys, max(n_vendors, 1))
+    item_qty = np.bincount(pair_item, weights=pair_qty, minlength=n_items)
+    share = np.divide(pair_qty, item_qty[pair_item], out=np.zeros(len(pair_qty)), where=item_qty[pair_item] > 0)
+
+    risk = vendor_risk(vendor_df, config, vendor_column).reindex(vendors).fillna(0.0).to_numpy(dtype="float64")
+    item_risk = np.bincount(pair_item, weights=share * risk[pair_vendor], minlength=n_items)
+    item_suppliers = np.bincount(pair_item, minlength=n_items)
+    # main supplier: first pair with the item's largest share (pairs are already sorted by item)
+    item_max = np.zeros(n_items)
+    np.maximum.at(item_max, pair_item, share)
+    top = np.flatnonzero(share == item_max[pair_item])
+    top = top[np.r_[True, pair_item[top][1:] != pair_item[top][:-1]]] if len(top) else top
+    main_vendor = np.full(n_items, -1, dtype="int64")
+    main_vendor[pair_item[top]] = pair_vendor[top]
+
+    # hash join: SKU -> item slot; SKUs whose item was never ordered get slot -1,
+    # which reads the trailing "no supplier" entry of each per-item array
+    slot = items.get_indexer(pd.Index(inv["Item Code"].to_numpy(dtype=object)))
+    matched = slot >= 0
+    urgency = stockout_urgency(inv, today)
+    sku_risk = np.append(item_risk, np.nan)[slot]
+    sku = pd.DataFrame({
+        "Supplier Risk": sku_risk,
+        "Suppliers": np.append(item_suppliers, 0)[slot],
+        "Main Supplier": pd.Categorical.from_codes(np.append(main_vendor, -1)[slot], categories=vendors),
+        "Stock-out Urgency": urgency,
+        "Exposure": urgency * np.nan_to_num(sku_risk),
+    }, index=inv.index)
+
+    # vendor roll-up over the SKUs each vendor supplies
+    sku_urgency = np.zeros(n_items)
+    np.maximum.at(sku_urgency, slot[matched], urgency[matched])
+    at_risk = sku_urgency[pair_item] > 0
+    stocked = np.zeros(n_items, dtype=bool)
+    stocked[slot[matched]] = True
+    vendor = pd.DataFrame({
+        "Vendor Risk": risk,
+        "SKUs Supplied": np.bincount(pair_vendor, weights=stocked[pair_item], minlength=n_vendors).astype("int64"),
+        "At-risk SKUs": np.bincount(pair_vendor, weights=at_risk & stocked[pair_item],
+                                    minlength=n_vendors).astype("int64"),
+        "Exposure": np.bincount(pair_vendor, weights=share * sku_urgency[pair_item],
+                                minlength=n_vendors) * risk,
+    }, index=pd.Index(vendors, name=vendor_column))
+    return sku, vendor.sort_values("Exposure", ascending=False, kind="stable")
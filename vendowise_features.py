@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+from vendowise_aggregates import DeliveryAggregates, QueuedSums
+from vendowise_ingest import DEFAULT_CHUNK_ROWS, iter_typed_chunks
+from vendowise_model import MODEL_PATH, predict_proba, supplier_features
+from vendowise_risk_engine import as_datetime, numeric_values
+from vendowise_store import read_dataset, write_dataset
+
+# ---------------------------
+# Supplier Features from the PO Ledger
+# ---------------------------
+# sample_supplier_data.csv-schema ledgers are folded into per-supplier state
+# once: whole-history sums and a delay histogram (DeliveryAggregates) plus
+# per-supplier daily sums for the rolling windows. New POs are appended to the
+# same state, so features never rescan the ledger. Training and inference both
+# read their inputs from LedgerFeatures.features(). Each batch's daily sums are
+# queued (QueuedSums) and folded into the daily table when it is read.
+WINDOWS_DAYS = (30, 90)
+DELAY_PERCENTILES = (0.5, 0.9)
+DAILY_FIELDS = ["po_count", "ordered_qty", "rejected_qty", "delay_days_sum", "delay_count"]
+EPOCH = pd.Timestamp("1970-01-01")
+
+
+def ledger_delay_days(ledger):
+    """Whole days between promised and received date (NaN until received)."""
+    delta = as_datetime(ledger["Received_Date"]) - as_datetime(ledger["Promised_Date"])
+    return delta.dt.days.to_numpy(dtype="float64")
+
+
+def event_days(ledger):
+    """Day number (since 1970-01-01) a PO counts towards the rolling windows.
+
+    Received POs count on their receipt date, open POs on their order date.
+    """
+    when = as_datetime(ledger["Received_Date"])
+    if "Order_Date" in ledger.columns:
+        when = when.fillna(as_datetime(ledger["Order_Date"]))
+    return ((when - EPOCH).dt.days).to_numpy(dtype="float64")
+
+
+class LedgerFeatures:
+    """Incremental per-supplier feature state for a PO ledger."""
+
+    def __init__(self):
+        self.totals = DeliveryAggregates("Supplier")
+        self.daily = pd.DataFrame(columns=DAILY_FIELDS, dtype="float64",
+                                  index=pd.MultiIndex.from_arrays([[], []], names=["Supplier", "day"]))
+
+    def __len__(self):
+        return len(self.totals)
+
+    @property
+    def daily(self):
+        """Per-(Supplier, day) sums."""
+        return self._daily.table
+
+    @daily.setter
+    def daily(self, frame):
+        self._daily = QueuedSums(frame)
+
+    def append(self, ledger):
+        """Fold a batch of ledger rows (new POs) into the state."""
+        if len(ledger) == 0:
+            return self
+        delay = ledger_delay_days(ledger)
+        ordered = numeric_values(ledger, "Qty_Ordered")
+        rejected = numeric_values(ledger, "Qty_Rejected")
+        # the ledger has no received qty; rejection rate is rejected / ordered
+        self.totals.append(pd.DataFrame({
+            "Supplier": ledger["Supplier"].to_numpy(dtype=object),
+            "ordered_qty": ordered,
+            "received_qty": ordered,
+            "rejected_qty": rejected,
+        }), delay)
+
+        has_delay = ~np.isnan(delay)
+        parts = pd.DataFrame({
+            "po_count": np.ones(len(ledger)),
+            "ordered_qty": np.nan_to_num(ordered),
+            "rejected_qty": np.nan_to_num(rejected),
+            "delay_days_sum": np.where(has_delay, delay, 0.0),
+            "delay_count": has_delay.astype("float64"),
+        })
+        keys = [ledger["Supplier"].to_numpy(dtype=object), event_days(ledger)]
+        daily = parts.groupby(keys, sort=False).sum()
+        daily.index = daily.index.set_names(["Supplier", "day"])
+        self._daily.add(daily)
+        return self
+
+    def merge(self, other):
+        """Add another LedgerFeatures state, e.g. one per ledger file built in parallel."""
+        self.totals.merge(other.totals)
+        if not other.daily.empty:
+            self._daily.add(other.daily)
+        return self
+
+    def last_day(self):
+        days = self.daily.index.get_level_values("day")
+        return pd.NaT if len(days) == 0 else EPOCH + pd.Timedelta(days=float(days.max()))
+
+    def window_sums(self, as_of, days):
+        """Per-supplier daily sums over the `days` days up to and including as_of."""
+        end = (pd.Timestamp(as_of) - EPOCH).days
+        day = self.daily.index.get_level_values("day").to_numpy()
+        recent = self.daily[(day > end - days) & (day <= end)]
+        sums = recent.groupby(level="Supplier", sort=False).sum()
+        return sums.reindex(self.totals.keys, fill_value=0.0)
+
+    def features(self, as_of=None, windows=WINDOWS_DAYS, percentiles=DELAY_PERCENTILES):
+        """Per-supplier feature table indexed by Supplier.
+
+        Whole-history columns come from the running totals; the *_{w}d columns
+        cover the w days up to as_of (default: the latest PO in the state).
+        Rates with no underlying POs are NaN.
+        """
+        totals = self.totals.totals()
+        avg_delay, rejection = supplier_features(totals["delay_days_sum"], totals["delay_count"],
+                                                 totals["rejected_qty"], totals["ordered_qty"])
+        out = pd.DataFrame({
+            "Avg_Delay_Days": avg_delay,
+            "Rejection_Rate": rejection,
+            "PO_Count": totals["po_count"].to_numpy(dtype="int64"),
+            "Late_Share": 1 - self.totals.on_time_rate(0),
+        }, index=self.totals.keys)
+        for q in percentiles:
+            out[f"Delay_P{round(q * 100)}_Days"] = self.totals.delay_quantile(q)
+
+        as_of = self.last_day() if as_of is None else as_of
+        for w in windows:
+            if pd.isna(as_of):
+                sums = pd.DataFrame(0.0, index=self.totals.keys, columns=DAILY_FIELDS)
+            else:
+                sums = self.window_sums(as_of, w)
+            out[f"Avg_Delay_Days_{w}d"], out[f"Rejection_Rate_{w}d"] = supplier_features(
+                sums["delay_days_sum"], sums["delay_count"], sums["rejected_qty"], sums["ordered_qty"])
+            out[f"PO_Count_{w}d"] = sums["po_count"].to_numpy(dtype="int64")
+        return out
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def save(self, prefix):
+        write_dataset(self.totals.to_frame(), f"{prefix}-totals.arrow")
+        write_dataset(self.daily.reset_index(), f"{prefix}-daily.arrow")
+
+    @classmethod
+    def load(cls, prefix):
+        state = cls()
+        state.totals = DeliveryAggregates.from_frame(read_dataset(f"{prefix}-totals.arrow"), "Supplier")
+        state.daily = read_dataset(f"{prefix}-daily.arrow").set_index(["Supplier", "day"])
+        return state
+
+
+def ledger_features(source, as_of=None, chunksize=DEFAULT_CHUNK_ROWS):
+    """Feature table for a whole ledger: a DataFrame, or a CSV read chunk by chunk."""
+    state = LedgerFeatures()
+    if isinstance(source, pd.DataFrame):
+        state.append(source)
+    else:
+        for chunk in iter_typed_chunks(source, "ledger", chunksize):
+            state.append(chunk)
+    return state.features(as_of)
+
+
+def score_ledger(source, as_of=None, model_path=MODEL_PATH):
+    """ledger_features() plus the supplier risk model's probability (NaN without a model)."""
+    features = ledger_features(source, as_of)
+    features["Model_Risk_Prob"] = predict_proba(features, path=model_path)
+    return features
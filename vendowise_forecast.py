@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# Stock-out Forecast
+# ---------------------------
+# Straight-line consumption from today's stock, plus the next PO arriving on
+# Next PO Delivery Date + Expected Delay (days). Everything is computed for all
+# SKUs at once; a SKU with no open PO simply never gets replenished.
+HORIZONS_DAYS = (7, 14, 30, 60, 90)
+
+
+def _column(inv, name, fill=np.nan):
+    if name not in inv.columns:
+        return np.full(len(inv), fill, dtype="float64")
+    values = pd.to_numeric(inv[name], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    return np.where(np.isnan(values), fill, values)
+
+
+def _to_dates(today, days):
+    days = np.where(np.isfinite(days), days, np.nan)
+    return today + pd.to_timedelta(days, unit="D")
+
+
+def supply_inputs(inv, today):
+    """Per-SKU arrays: stock, daily consumption, buffer days, PO qty and PO arrival offset in days."""
+    stock = _column(inv, "Current Stock (Qty)", 0.0)
+    consumption = _column(inv, "Daily Avg Consumption", 0.0)
+    buffer_days = _column(inv, "Buffer Stock (days)", 0.0)
+    po_qty = _column(inv, "PO Delivery Qty", 0.0)
+    po_date = pd.to_datetime(inv["Next PO Delivery Date"], errors="coerce") if "Next PO Delivery Date" in inv.columns \
+        else pd.Series(pd.NaT, index=inv.index)
+    arrival = (po_date - today).dt.days.to_numpy(dtype="float64") + _column(inv, "Expected Delay (days)", 0.0)
+    # a PO already overdue is assumed to land today; no qty means nothing arrives
+    arrival = np.where((po_qty > 0) & ~np.isnan(arrival), np.maximum(arrival, 0.0), np.nan)
+    return stock, consumption, buffer_days, po_qty, arrival
+
+
+def projected_stock(inv, days, today=None):
+    """(n_skus, len(days)) matrix of projected on-hand quantity days from today."""
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+    stock, consumption, _, po_qty, arrival = supply_inputs(inv, today)
+    days = np.asarray(days, dtype="float64")[None, :]
+    arrival = arrival[:, None]
+    cons = consumption[:, None]
+    before = np.maximum(stock[:, None] - cons * days, 0.0)
+    at_arrival = np.maximum(stock[:, None] - cons * np.nan_to_num(arrival), 0.0) + po_qty[:, None]
+    after = np.maximum(at_arrival - cons * (days - np.nan_to_num(arrival)), 0.0)
+    return np.where(arrival <= days, after, before)
+
+
+def stockout_forecast(inv, today=None, horizons=HORIZONS_DAYS):
+    """Per-SKU stock-out projection, indexed like inv.
+
+    Days of Stock: cover from current stock alone.
+    Stock-out Gap (days): days with no stock before the (delayed) PO arrives.
+    Projected Stock-out Date / Buffer Breach Date: first day stock hits zero /
+    drops below the SKU's buffer, taking the next PO into account.
+    Earliest Breach Horizon (days): first of `horizons` on or after the
+    Buffer Breach Date, so the two always agree (NaN past the last horizon).
+    """
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+    stock, consumption, buffer_days, po_qty, arrival = supply_inputs(inv, today)
+    consuming = consumption > 0
+    safe_cons = np.where(consuming, consumption, 1.0)
+
+    days_left = np.where(consuming, stock / safe_cons, np.inf)
+    arrives = ~np.isnan(arrival)
+    arrival_day = np.where(arrives, arrival, np.inf)
+    cover_after = (np.maximum(stock - consumption * np.nan_to_num(arrival), 0.0) + po_qty) / safe_cons
+
+    gap = np.where(arrives, np.maximum(arrival_day - days_left, 0.0), np.nan)
+    stockout_day = np.where(arrives & (days_left >= arrival_day), arrival_day + cover_after, days_left)
+    stockout_day = np.where(consuming, stockout_day, np.inf)
+
+    breach_before = np.maximum(days_left - buffer_days, 0.0)
+    breach_after = arrival_day + np.maximum(cover_after - buffer_days, 0.0)
+    breach_day = np.where(breach_before < arrival_day, breach_before, breach_after)
+    breach_day = np.where(consuming, breach_day, np.inf)
+
+    horizons = np.asarray(horizons, dtype="float64")
+    slot = np.searchsorted(horizons, np.floor(breach_day), side="left")
+    earliest = np.append(horizons, np.nan)[slot]
+
+    return pd.DataFrame({
+        "Days of Stock": days_left,
+        "PO Arrival Date": _to_dates(today, arrival),
+        "Stock-out Gap (days)": gap,
+        "Projected Stock-out Date": _to_dates(today, np.floor(stockout_day)),
+        "Buffer Breach Date": _to_dates(today, np.floor(breach_day)),
+        "Earliest Breach Horizon (days)": earliest,
+    }, index=inv.index)
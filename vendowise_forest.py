@@ -0,0 +1,141 @@
+"""Flat-array export of the supplier risk forest.
+
+    python vendowise_forest.py mock_supplier_risk_model.pkl
+
+Writes <model>.forest.npy (every tree's nodes in one structured array) and
+<model>.forest.json (tree offsets and shape). The .npy is memory-mapped on
+load, so a new worker starts serving without unpickling anything and all
+worker processes on a host share the same page-cache copy of the trees.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+# Leaves point to themselves with an infinite threshold, so a traversal step
+# leaves finished (row, tree) cells where they are and they can be dropped.
+NODE_DTYPE = np.dtype([
+    ("feature", "<i4"),
+    ("threshold", "<f8"),  # sklearn compares float32 inputs against float64 thresholds
+    ("left", "<i4"),
+    ("right", "<i4"),
+    ("value", "<f4"),      # leaf probability of the high-risk class
+])
+BLOCK_CELLS = 1 << 20  # rows x trees traversed at once
+
+
+def forest_paths(path):
+    base = os.path.splitext(path)[0]
+    return f"{base}.forest.npy", f"{base}.forest.json"
+
+
+def flatten_forest(model):
+    """(nodes, meta) for a fitted RandomForestClassifier with 0/1 labels (one or both classes)."""
+    # leaf value = P(class 1), or 0 when class 1 was never seen. The trees see
+    # encoded labels, so their value columns follow the forest's classes_.
+    high = np.flatnonzero(np.asarray(model.classes_) == 1)
+    parts, roots, offset = [], [], 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n = tree.node_count
+        leaf = tree.children_left < 0
+        own = np.arange(offset, offset + n, dtype="int32")
+        counts = tree.value[:, 0, :]
+        nodes = np.empty(n, dtype=NODE_DTYPE)
+        nodes["feature"] = np.where(leaf, 0, tree.feature)
+        nodes["threshold"] = np.where(leaf, np.inf, tree.threshold)
+        nodes["left"] = np.where(leaf, own, tree.children_left + offset)
+        nodes["right"] = np.where(leaf, own, tree.children_right + offset)
+        nodes["value"] = counts[:, high[0]] / counts.sum(axis=1) if len(high) else 0.0
+        parts.append(nodes)
+        roots.append(offset)
+        offset += n
+    meta = {
+        "roots": roots,
+        "n_features": int(model.n_features_in_),
+        "classes": [int(c) for c in model.classes_],
+    }
+    return np.concatenate(parts), meta
+
+
+def export_forest(model, path):
+    """Write the flat forest next to model path; atomic per file, metadata first."""
+    nodes, meta = flatten_forest(model)
+    npy_path, json_path = forest_paths(path)
+    tmp_path = f"{npy_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, nodes)
+    with open(f"{json_path}.{os.getpid()}.tmp", "w") as f:
+        json.dump(meta, f)
+    os.replace(f"{json_path}.{os.getpid()}.tmp", json_path)
+    os.replace(tmp_path, npy_path)
+    return npy_path
+
+
+class FlatForest:
+    """Memory-mapped forest with the predict_proba interface of the sklearn model."""
+
+    def __init__(self, nodes, meta):
+        self.nodes = nodes
+        self.roots = np.asarray(meta["roots"], dtype="int32")
+        self.n_features_in_ = meta["n_features"]
+        self.classes_ = np.asarray(meta["classes"])
+        self.feature = nodes["feature"]
+        self.threshold = nodes["threshold"]
+        self.left = nodes["left"]
+        self.right = nodes["right"]
+        self.value = nodes["value"]
+
+    def _leaf_mean(self, X):
+        """Mean leaf value per row; only (row, tree) cells not yet at a leaf are stepped."""
+        n_rows, n_trees = X.shape[0], len(self.roots)
+        flat_x = X.ravel()
+        node = np.tile(self.roots, n_rows)
+        cell_x = np.repeat(np.arange(n_rows) * X.shape[1], n_trees)
+        active = np.arange(len(node))
+        while len(active):
+            current = node[active]
+            go_left = flat_x[cell_x[active] + self.feature[current]] <= self.threshold[current]
+            step = np.where(go_left, self.left[current], self.right[current])
+            node[active] = step
+            active = active[step != current]
+        return self.value[node].reshape(n_rows, n_trees).mean(axis=1, dtype="float64")
+
+    def predict_proba(self, X):
+        X = np.ascontiguousarray(np.asarray(X, dtype="float32"), dtype="float64")
+        proba = np.empty(len(X), dtype="float64")
+        block = max(1, BLOCK_CELLS // max(len(self.roots), 1))
+        for start in range(0, len(X), block):
+            proba[start:start + block] = self._leaf_mean(X[start:start + block])
+        return np.column_stack([1 - proba, proba])
+
+
+def load_forest(path):
+    """FlatForest for model path, or None when no current flat export exists.
+
+    An export older than the pickle next to it is ignored.
+    """
+    npy_path, json_path = forest_paths(path)
+    if not (os.path.exists(npy_path) and os.path.exists(json_path)):
+        return None
+    if os.path.exists(path) and os.path.getmtime(npy_path) < os.path.getmtime(path):
+        return None
+    with open(json_path, "r") as f:
+        meta = json.load(f)
+    return FlatForest(np.load(npy_path, mmap_mode="r"), meta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a supplier risk model pickle as a flat forest.")
+    parser.add_argument("model", help="joblib pickle of a RandomForestClassifier")
+    args = parser.parse_args(argv)
+
+    import joblib
+    npy_path = export_forest(joblib.load(args.model), args.model)
+    print(f"✅ {args.model} ({os.path.getsize(args.model):,} bytes) -> {npy_path} "
+          f"({os.path.getsize(npy_path):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,25 @@
-
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import json
-import os
-
-# ----------------- PASSWORD PROTECTION -----------------
-def check_password():
-    def password_entered():
-        if st.session_state["password"] == "vendowise123":
-            st.session_state["password_correct"] = True
-        else:
-            st.session_state["password_correct"] = False
-
-    if "password_correct" not in st.session_state:
-        st.text_input("Enter password", type="password", on_change=password_entered, key="password")
-        st.stop()
-    elif not st.session_state["password_correct"]:
-        st.text_input("Enter password", type="password", on_change=password_entered, key="password")
-        st.error("😕 Password incorrect")
-        st.stop()
+from vendowise_shell import check_password, sidebar_logo
 
+st.set_page_config(page_title="VendoWise Dashboard", layout="wide")
 check_password()
-# -------------------------------------------------------
 
-st.set_page_config(page_title="VendoWise Dashboard", layout="wide")
-st.sidebar.image("Iniksa-TM.png", width=150)
+# Data and plotting modules are only imported once the password check has passed
+import pandas as pd
+from vendowise_cache import load_dataset_index, load_scored_vendor_csv, load_sensitivity_index
+from vendowise_config import freeze, load_config, save_config
+from vendowise_diagnostics import stage, start_run
+from vendowise_risk_engine import apply_risk_flags, reason_counts as risk_reason_counts
+from vendowise_tables import ORANGE
+from vendowise_widgets import bar_chart, diagnostics_panel, paged_table, scenario_panel, sensitivity_panel, stop
+
+start_run("vendowise_full_configurable")
+
+sidebar_logo()
 st.sidebar.title("Your Supplier Risk Intelligence Hub")
 nav = st.sidebar.radio("Go to", ["Dashboard", "PO Entry Simulation", "Configuration Panel"])
 
-config_path = "vendowise_config.json"
-default_config = {
-    "use_rejected_qty": True,
-    "use_payment_terms": True,
-    "use_stock_buffer": True,
-    "use_location_risk": True,
-    "use_partial_delivery": False,
-    "thresholds": {
-        "delay_days": 5,
-        "rejection_rate": 0.05,
-        "payment_terms_days": 60,
-        "min_stock_buffer_days": 7,
-        "max_location_risk": 5
-    }
-}
-
-if not os.path.exists(config_path):
-    with open(config_path, "w") as f:
-        json.dump(default_config, f, indent=4)
-
-with open(config_path, "r") as f:
-    config = json.load(f)
+config = load_config()
 
 # Sample data toggle or upload
 data_mode = st.sidebar.radio("Choose data input mode", ["Sample Data", "Upload CSV"])
@@ -67,57 +35,43 @@ if data_mode == "Sample Data":
         "stock_buffer_days": [10, 5, 12, 3, 15],
         "location_risk": [2, 6, 3, 7, 1]
     })
+    with stage("risk flags"):
+        apply_risk_flags(df, config)
 else:
     uploaded_file = st.sidebar.file_uploader("Upload Vendor Data CSV", type="csv")
     if uploaded_file:
-        df = pd.read_csv(uploaded_file, parse_dates=["expected_delivery_date", "actual_delivery_date"])
+        try:
+            with stage("load + risk flags"):
+                df = load_scored_vendor_csv(uploaded_file, config)
+        except (ValueError, TypeError) as exc:
+            st.error(f"Could not read {uploaded_file.name}: {exc}")
+            stop()
     else:
         st.warning("Please upload a CSV file to proceed.")
-        st.stop()
-
-# Risk calculation
-def risk_flags(row):
-    delay = (row["actual_delivery_date"] - row["expected_delivery_date"]).days
-    flags = []
-    if delay > config["thresholds"]["delay_days"]:
-        flags.append("Delay")
-    if config["use_rejected_qty"]:
-        rejection = row["rejected_qty"] / row["received_qty"] if row["received_qty"] else 0
-        if rejection > config["thresholds"]["rejection_rate"]:
-            flags.append("Rejection")
-    if config["use_payment_terms"] and row["payment_terms_days"] > config["thresholds"]["payment_terms_days"]:
-        flags.append("Payment Terms")
-    if config["use_stock_buffer"] and row["stock_buffer_days"] < config["thresholds"]["min_stock_buffer_days"]:
-        flags.append("Low Stock Buffer")
-    if config["use_location_risk"] and row["location_risk"] > config["thresholds"]["max_location_risk"]:
-        flags.append("Location Risk")
-    if config["use_partial_delivery"] and row["received_qty"] < row["ordered_qty"]:
-        flags.append("Partial Delivery")
-    return ", ".join(flags)
-
-df["Risk Reasons"] = df.apply(risk_flags, axis=1)
+        stop()
 
 if nav == "Dashboard":
     st.title("📊 Supplier Risk Dashboard")
-    st.dataframe(df)
+    paged_table(df, key="risk", highlight=[("Risk Reasons", lambda s: s != "", ORANGE)])
 
     # Bar Chart
-    all_reasons = df["Risk Reasons"].str.split(", ").explode().dropna()
-    if not all_reasons.empty:
-        reason_counts = all_reasons.value_counts()
-        fig, ax = plt.subplots(figsize=(8, 4))
-        sns.barplot(x=reason_counts.index, y=reason_counts.values, ax=ax)
-        ax.set_title("Risk Reasons Frequency")
-        ax.set_ylabel("Count")
-        ax.set_xlabel("Reason")
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
+    with stage("reason counts"):
+        reason_counts = risk_reason_counts(df["Risk Bits"])
+    if not reason_counts.empty:
+        bar_chart(reason_counts, title="Risk Reasons Frequency", xlabel="Reason", ylabel="Count")
         
 # PO Entry Simulation
 elif nav == "PO Entry Simulation":
     st.markdown("## ✏️ PO Entry Simulation")
+    from vendowise_index import DatasetIndex
+    from vendowise_model import predict_one, risk_label
+    from vendowise_scenarios import vendor_profile
 
-    supplier = st.selectbox("Select Supplier", df["Supplier"].unique())
+    if data_mode == "Sample Data":
+        vendor_index = DatasetIndex(df, vendor_column="Supplier")
+    else:
+        vendor_index = load_dataset_index(uploaded_file)
+    supplier = st.selectbox("Select Supplier", vendor_index.vendor_names())
     
     delay = st.number_input("Expected Delay (days)", min_value=0, max_value=30, value=5)
     reject = st.number_input("Expected Rejection Rate (%)", min_value=0.0, max_value=20.0, value=1.0) / 100
@@ -139,28 +93,51 @@ elif nav == "PO Entry Simulation":
         (delay > max_delay)
     ) else "Low Risk 🟢"
 
-    st.success(f"Predicted Risk for **{supplier}**: **{risk}**")
+    with stage("model"):
+        proba = predict_one(delay, reject)
+    if proba is None:
+        st.success(f"Predicted Risk for **{supplier}**: **{risk}**")
+    else:
+        st.success(f"Predicted Risk for **{supplier}**: **{risk_label(proba)}** (model probability {proba:.0%})")
+        st.caption(f"Threshold check: {risk}")
+
+    st.markdown("## 🧭 Portfolio What-If")
+    with stage("vendor profile"):
+        profile = vendor_profile(df, "Supplier" if data_mode == "Sample Data" else "vendor_name")
+    scenario_panel(profile, config)
 
 # Configuration
 elif nav == "Configuration Panel":
     st.title("⚙️ Configuration Settings")
+    from vendowise_sensitivity import SensitivityIndex
+    # widgets live outside the form so the sensitivity counts follow them; only saving is a form action
+    edited = config.to_dict()
+    st.subheader("Toggle Parameters")
+    edited["use_rejected_qty"] = st.checkbox("Use Rejected Quantity", value=edited["use_rejected_qty"])
+    edited["use_payment_terms"] = st.checkbox("Use Payment Terms", value=edited["use_payment_terms"])
+    edited["use_stock_buffer"] = st.checkbox("Use Stock Buffer", value=edited["use_stock_buffer"])
+    edited["use_location_risk"] = st.checkbox("Use Location Risk", value=edited["use_location_risk"])
+    edited["use_partial_delivery"] = st.checkbox("Use Partial Delivery", value=edited["use_partial_delivery"])
+    st.subheader("Thresholds")
+    edited["thresholds"]["delay_days"] = st.slider("Max Acceptable Delay (days)", 0, 30, edited["thresholds"]["delay_days"])
+    edited["thresholds"]["rejection_rate"] = st.slider("Max Rejection Rate", 0.0, 0.2, edited["thresholds"]["rejection_rate"])
+    edited["thresholds"]["payment_terms_days"] = st.slider("Max Payment Terms (days)", 15, 120, edited["thresholds"]["payment_terms_days"])
+    edited["thresholds"]["min_stock_buffer_days"] = st.slider("Min Stock Buffer (days)", 0, 30, edited["thresholds"]["min_stock_buffer_days"])
+    edited["thresholds"]["max_location_risk"] = st.slider("Max Location Risk", 0, 10, edited["thresholds"]["max_location_risk"])
+    edited = freeze(edited)
+
     with st.form("config_form"):
-        st.subheader("Toggle Parameters")
-        config["use_rejected_qty"] = st.checkbox("Use Rejected Quantity", value=config["use_rejected_qty"])
-        config["use_payment_terms"] = st.checkbox("Use Payment Terms", value=config["use_payment_terms"])
-        config["use_stock_buffer"] = st.checkbox("Use Stock Buffer", value=config["use_stock_buffer"])
-        config["use_location_risk"] = st.checkbox("Use Location Risk", value=config["use_location_risk"])
-        config["use_partial_delivery"] = st.checkbox("Use Partial Delivery", value=config["use_partial_delivery"])
-        st.subheader("Thresholds")
-        config["thresholds"]["delay_days"] = st.slider("Max Acceptable Delay (days)", 0, 30, config["thresholds"]["delay_days"])
-        config["thresholds"]["rejection_rate"] = st.slider("Max Rejection Rate", 0.0, 0.2, config["thresholds"]["rejection_rate"])
-        config["thresholds"]["payment_terms_days"] = st.slider("Max Payment Terms (days)", 15, 120, config["thresholds"]["payment_terms_days"])
-        config["thresholds"]["min_stock_buffer_days"] = st.slider("Min Stock Buffer (days)", 0, 30, config["thresholds"]["min_stock_buffer_days"])
-        config["thresholds"]["max_location_risk"] = st.slider("Max Location Risk", 0, 10, config["thresholds"]["max_location_risk"])
-
-        submitted = st.form_submit_button("💾 Save Settings")
-        if submitted:
-            with open(config_path, "w") as f:
-                json.dump(config, f, indent=4)
+        if st.form_submit_button("💾 Save Settings"):
+            config = save_config(edited)
             st.success("Configuration saved!")
 
+    st.subheader("📐 Threshold Sensitivity")
+    with stage("sensitivity"):
+        if data_mode == "Sample Data":
+            sensitivity = SensitivityIndex(df, vendor_column="Supplier")
+        else:
+            sensitivity = load_sensitivity_index(uploaded_file)
+        sensitivity_panel(sensitivity, edited)
+
+diagnostics_panel()
+
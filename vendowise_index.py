@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# Lookup Indexes
+# ---------------------------
+# Built once per dataset version (see vendowise_cache) and shared by every
+# session. Row numbers are positions in the frame the index was built from, so
+# the index must be used with that frame (or one with the same row order).
+#
+# vendor -> rows: rows grouped by vendor in one stable argsort, so a vendor's
+#                 POs are one contiguous slice of `order` (CSR layout)
+# item -> vendors: distinct (item, vendor) pairs in the same layout
+# PO number -> row: a hash index on the first row of every PO number
+
+
+def _grouped(codes, n_groups):
+    """(order, offsets): row order grouping codes 0..n_groups-1, rows with code -1 dropped."""
+    order = np.argsort(codes, kind="stable")
+    order = order[np.count_nonzero(codes < 0):]
+    offsets = np.zeros(n_groups + 1, dtype="int64")
+    np.cumsum(np.bincount(codes[codes >= 0], minlength=n_groups), out=offsets[1:])
+    return order, offsets
+
+
+class DatasetIndex:
+    """Vendor, item and PO number lookups over one vendor_data.csv-schema frame."""
+
+    def __init__(self, df, vendor_column="vendor_name", item_column="item_code", po_column="po_number"):
+        self.n_rows = len(df)
+        vendor_codes, vendors = pd.factorize(df[vendor_column], sort=True)
+        self.vendors = pd.Index(vendors, dtype=object, name=vendor_column)
+        self.vendor_order, self.vendor_offsets = _grouped(vendor_codes, len(self.vendors))
+
+        self.items = pd.Index([], dtype=object, name=item_column)
+        self.item_vendor_codes = np.empty(0, dtype="int64")
+        self.item_offsets = np.zeros(1, dtype="int64")
+        if item_column in df.columns:
+            item_codes, items = pd.factorize(df[item_column], sort=True)
+            self.items = pd.Index(items, dtype=object, name=item_column)
+            known = (item_codes >= 0) & (vendor_codes >= 0)
+            n_vendors = len(self.vendors)
+            pairs = np.unique(item_codes[known].astype("int64") * n_vendors + vendor_codes[known])
+            pair_items, self.item_vendor_codes = np.divmod(pairs, n_vendors) if n_vendors else (pairs, pairs)
+            self.item_offsets = np.zeros(len(self.items) + 1, dtype="int64")
+            np.cumsum(np.bincount(pair_items, minlength=len(self.items)), out=self.item_offsets[1:])
+
+        self.po_index = pd.Index([], dtype=object)
+        self.po_rows = np.empty(0, dtype="int64")
+        if po_column in df.columns:
+            po = pd.Series(df[po_column].to_numpy(dtype=object))
+            first = ~po.duplicated() & po.notna()
+            self.po_index = pd.Index(po[first].to_numpy(), dtype=object, name=po_column)
+            self.po_rows = np.flatnonzero(first.to_numpy())
+
+    def __len__(self):
+        return len(self.vendors)
+
+    # ---------------------------
+    # Vendors
+    # ---------------------------
+    def vendor_names(self):
+        """Sorted distinct vendors, e.g. for a supplier picker."""
+        return self.vendors.tolist()
+
+    def vendor_rows(self, vendor):
+        """Row positions of one vendor's POs in original order; empty for an unknown vendor."""
+        slot = self.vendors.get_indexer([vendor])[0]
+        if slot < 0:
+            return np.empty(0, dtype="int64")
+        return self.vendor_order[self.vendor_offsets[slot]:self.vendor_offsets[slot + 1]]
+
+    def vendor_frame(self, df, vendor):
+        """One vendor's POs from the indexed frame, without scanning the other vendors' rows."""
+        return df.iloc[self.vendor_rows(vendor)]
+
+    def vendor_po_counts(self):
+        return pd.Series(np.diff(self.vendor_offsets), index=self.vendors, name="po_count")
+
+    # ---------------------------
+    # Items
+    # ---------------------------
+    def item_slots(self, codes):
+        """Position of every item code in self.items (-1 when unknown); one hash probe per code."""
+        return self.items.get_indexer(pd.Index(np.asarray(codes, dtype=object)))
+
+    def item_vendors(self, item):
+        """Vendors that supplied an item code, sorted."""
+        slot = self.item_slots([item])[0]
+        if slot < 0:
+            return []
+        codes = self.item_vendor_codes[self.item_offsets[slot]:self.item_offsets[slot + 1]]
+        return self.vendors[codes].tolist()
+
+    def item_vendor_counts(self, codes):
+        """Number of distinct vendors per item code (0 for codes never ordered), aligned with codes."""
+        counts = np.append(np.diff(self.item_offsets), 0)  # slot -1 reads the trailing 0
+        return counts[self.item_slots(codes)]
+
+    # ---------------------------
+    # POs
+    # ---------------------------
+    def po_row(self, po_number):
+        """Row position of a PO number (its first row), or None."""
+        slot = self.po_index.get_indexer([po_number])[0]
+        return None if slot < 0 else int(self.po_rows[slot])
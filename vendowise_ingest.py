@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+
+from vendowise_risk_engine import RISK_BITS, delivery_delay_days, enabled_rules, risk_bitmask
+
+# ---------------------------
+# Vendor PO Schema
+# ---------------------------
+# Compact dtypes for vendor_data.csv-schema files. Numeric columns are float32:
+# real exports carry fractional quantities, blanks and stray text, which are
+# read as NaN instead of aborting the whole upload.
+VENDOR_DTYPES = {
+    "vendor_name": "category",
+    "item_code": "category",
+    "po_number": "string",
+    "ordered_qty": "float32",
+    "received_qty": "float32",
+    "rejected_qty": "float32",
+    "freight_cost": "float32",
+    "payment_terms_days": "float32",
+    "stock_buffer_days": "float32",
+    "location_risk": "float32",
+}
+VENDOR_DATE_COLUMNS = ["po_date", "expected_delivery_date", "actual_delivery_date"]
+VENDOR_COLUMNS = ["vendor_name", "item_code", "po_number"] + VENDOR_DATE_COLUMNS + [
+    "ordered_qty", "received_qty", "rejected_qty", "freight_cost",
+    "payment_terms_days", "stock_buffer_days", "location_risk"
+]
+
+
+# inventory_data.csv schema
+INVENTORY_DTYPES = {
+    "Item Code": "string",
+    "Item Description": "string",
+    "Current Stock (Qty)": "float32",
+    "Daily Avg Consumption": "float32",
+    "Buffer Stock (days)": "float32",
+    "PO Delivery Qty": "float32",
+    "Expected Delay (days)": "float32",
+}
+INVENTORY_DATE_COLUMNS = ["Next PO Delivery Date"]
+
+# sample_supplier_data.csv (PO ledger) schema
+LEDGER_DTYPES = {
+    "Supplier": "category",
+    "PO_Number": "string",
+    "Qty_Ordered": "float32",
+    "Qty_Rejected": "float32",
+}
+LEDGER_DATE_COLUMNS = ["Order_Date", "Promised_Date", "Received_Date"]
+
+# Column names of older exports, renamed to the schema names on read; the
+# original upload format of vendowise_full_configurable.py named the vendor
+# column "Supplier".
+LEGACY_COLUMNS = {
+    "vendor": {"Supplier": "vendor_name"},
+}
+
+# dtypes, date columns and the columns a file must have to be accepted, per dataset kind
+SCHEMAS = {
+    "vendor": (VENDOR_DTYPES, VENDOR_DATE_COLUMNS,
+               ["vendor_name", "expected_delivery_date", "actual_delivery_date",
+                "ordered_qty", "received_qty", "rejected_qty"]),
+    "inventory": (INVENTORY_DTYPES, INVENTORY_DATE_COLUMNS,
+                  ["Item Code", "Current Stock (Qty)", "Daily Avg Consumption", "Expected Delay (days)"]),
+    "ledger": (LEDGER_DTYPES, LEDGER_DATE_COLUMNS,
+               ["Supplier", "Promised_Date", "Received_Date", "Qty_Ordered", "Qty_Rejected"]),
+}
+
+DEFAULT_CHUNK_ROWS = 250_000
+# Uploads above this size are scored in streaming mode instead of loaded whole.
+# Overridden by "ingest": {"streaming_threshold_mb": ...} in the config; keep it
+# below Streamlit's upload cap (server.maxUploadSize, 200 MB by default) or
+# the streaming path is never reached from the dashboards.
+STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+# Running per-vendor sums; everything in the summary is derived from these.
+SUM_COLUMNS = ["po_count", "flagged_pos", "ordered_qty", "received_qty", "rejected_qty",
+               "freight_cost", "delay_days_sum", "delay_count", "late_pos"]
+
+
+def streaming_threshold_bytes(config=None):
+    """Upload size above which vendor files are only summarized, from the config's "ingest" section."""
+    if config is None or "ingest" not in config:
+        return STREAMING_THRESHOLD_BYTES
+    return int(config["ingest"]["streaming_threshold_mb"] * 1024 * 1024)
+
+
+# ---------------------------
+# Typed Readers
+# ---------------------------
+TEXT_DTYPES = ("category", "string")
+
+
+def _text_dtypes(dtypes):
+    """The dtypes safe to hand to read_csv; numeric columns are coerced afterwards."""
+    return {col: dtype for col, dtype in dtypes.items() if dtype in TEXT_DTYPES}
+
+
+def _apply_schema(df, kind):
+    """Rename legacy columns, coerce numbers (unparseable cells become NaN) and parse dates."""
+    dtypes, date_columns, _ = SCHEMAS[kind]
+    legacy = {old: new for old, new in LEGACY_COLUMNS.get(kind, {}).items()
+              if old in df.columns and new not in df.columns}
+    if legacy:
+        df = df.rename(columns=legacy)
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+        if dtype in TEXT_DTYPES:
+            if df[col].dtype != dtype:
+                df[col] = df[col].astype(dtype)
+        else:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+    for col in date_columns:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+def validate_columns(df, kind):
+    missing = [col for col in SCHEMAS[kind][2] if col not in df.columns]
+    if missing:
+        raise ValueError(f"{kind} data is missing required columns: {', '.join(missing)}")
+    return df
+
+
+def read_typed_csv(source, kind):
+    """Read a whole vendor/inventory CSV with the compact schema dtypes and validate it."""
+    df = pd.read_csv(source, dtype=_text_dtypes(SCHEMAS[kind][0]))
+    return validate_columns(_apply_schema(df, kind), kind)
+
+
+def iter_vendor_chunks(source, chunksize=DEFAULT_CHUNK_ROWS):
+    """Yield typed DataFrame chunks of a vendor PO CSV (path, buffer or uploaded file)."""
+    columns = set(VENDOR_COLUMNS) | set(LEGACY_COLUMNS["vendor"])
+    reader = pd.read_csv(source, usecols=lambda c: c in columns, dtype=_text_dtypes(VENDOR_DTYPES),
+                         chunksize=chunksize)
+    for chunk in reader:
+        yield validate_columns(_apply_schema(chunk, "vendor"), "vendor")
+
+
+def iter_typed_chunks(source, kind, chunksize=DEFAULT_CHUNK_ROWS):
+    """Yield validated, typed chunks of any SCHEMAS kind."""
+    for chunk in pd.read_csv(source, dtype=_text_dtypes(SCHEMAS[kind][0]), chunksize=chunksize):
+        yield validate_columns(_apply_schema(chunk, kind), kind)
+
+
+# ---------------------------
+# Per-chunk Aggregation
+# ---------------------------
+def summarize_chunk(chunk, config, bits=None):
+    """Per-vendor sums for one chunk, scored with the configured rules.
+
+    Pass bits when the chunk's risk bitmask has already been computed.
+    """
+    if bits is None:
+        bits = risk_bitmask(chunk, config)
+    delay = delivery_delay_days(chunk)
+    has_delay = ~np.isnan(delay)
+
+    parts = {
+        "po_count": np.ones(len(chunk), dtype=np.int64),
+        "flagged_pos": (bits != 0).astype(np.int64),
+        "delay_days_sum": np.where(has_delay, delay, 0.0),
+        "delay_count": has_delay.astype(np.int64),
+        "late_pos": (delay > config["thresholds"]["delay_days"]).astype(np.int64),
+    }
+    for col in ["ordered_qty", "received_qty", "rejected_qty", "freight_cost"]:
+        if col not in chunk.columns:  # freight_cost is optional (not in the legacy schema)
+            parts[col] = np.zeros(len(chunk))
+            continue
+        parts[col] = pd.to_numeric(chunk[col], errors="coerce").fillna(0).to_numpy(dtype="float64")
+    for reason in enabled_rules(config):
+        parts[reason] = ((bits & RISK_BITS[reason]) != 0).astype(np.int64)
+
+    frame = pd.DataFrame(parts, index=chunk.index)
+    sums = frame.groupby(chunk["vendor_name"], observed=True, sort=False).sum()
+    sums.index = sums.index.astype(str)
+    return sums
+
+
+def combine_summaries(running, chunk_sums):
+    if running is None:
+        return chunk_sums
+    return running.add(chunk_sums, fill_value=0)
+
+
+def finalize_summary(sums):
+    """Turn running sums into the per-vendor report."""
+    if sums is None:
+        sums = pd.DataFrame(columns=SUM_COLUMNS, dtype="float64")
+    summary = sums.copy()
+    summary.index.name = "vendor_name"
+    counts = ["po_count", "flagged_pos", "delay_count", "late_pos"] + [r for r in RISK_BITS if r in summary.columns]
+    summary[counts] = summary[counts].astype("int64")
+    summary["avg_delay_days"] = summary["delay_days_sum"] / summary["delay_count"].where(summary["delay_count"] > 0)
+    summary["rejection_rate"] = summary["rejected_qty"] / summary["received_qty"].where(summary["received_qty"] > 0)
+    summary["flagged_share"] = summary["flagged_pos"] / summary["po_count"]
+    return summary.sort_values("flagged_pos", ascending=False, kind="stable")
+
+
+# ---------------------------
+# Streaming Pipeline
+# ---------------------------
+def stream_vendor_summary(source, config, chunksize=DEFAULT_CHUNK_ROWS, on_chunk=None):
+    """Score a vendor PO CSV chunk by chunk and aggregate per vendor.
+
+    Only one chunk plus the per-vendor totals is held in memory. on_chunk, if
+    given, is called as on_chunk(rows_done, running_sums) after every chunk.
+    """
+    running = None
+    rows = 0
+    for chunk in iter_vendor_chunks(source, chunksize):
+        running = combine_summaries(running, summarize_chunk(chunk, config))
+        rows += len(chunk)
+        if on_chunk is not None:
+            on_chunk(rows, running)
+    return finalize_summary(running)
+
+
+def summary_reason_counts(summary):
+    """Flag counts per reason across all vendors, same shape as reason_counts()."""
+    reasons = [reason for reason in RISK_BITS if reason in summary.columns]
+    counts = summary[reasons].sum().astype("int64")
+    return counts[counts > 0].sort_values(ascending=False, kind="stable")
@@ -0,0 +1,230 @@
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from vendowise_aggregates import VendorAggregateStore
+from vendowise_ingest import combine_summaries, finalize_summary, iter_typed_chunks, summarize_chunk
+from vendowise_risk_engine import risk_config_key
+from vendowise_store import source_digest, store_dataset, stored_dataset
+
+# ---------------------------
+# Background Upload Jobs
+# ---------------------------
+# Uploaded files are parsed (and vendor files scored) chunk by chunk on a
+# shared thread pool, so a large upload neither blocks the session that sent
+# it nor the script runs of other sessions. Each job publishes its progress,
+# the rows parsed so far and running per-vendor sums after every chunk.
+# Parsing goes through the columnar store (vendowise_store) on the upload's
+# digest: a file seen before is read back typed instead of re-parsed, and the
+# typed rows of a new one are persisted for the next upload or dashboard.
+# Summary-only jobs are tied to a risk config; when a session submits the same
+# file with a newer config, its earlier unfinished jobs for that file are
+# cancelled, so dragging a threshold slider never queues a re-parse per step.
+JOB_WORKERS = min(4, os.cpu_count() or 1)
+JOB_CHUNK_ROWS = 100_000
+MAX_FINISHED_JOBS = 16
+
+
+def concat_chunks(chunks):
+    """Concatenate typed chunks, keeping columns categorical when every chunk had them so."""
+    if not chunks:
+        return None
+    frame = pd.concat(chunks, ignore_index=True)
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype) and \
+                not isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype("category")
+    return frame
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class ScoringJob:
+    """One uploaded file being parsed chunk by chunk on the job pool."""
+
+    def __init__(self, key, name, kind, size, config=None, keep_rows=True, owner=None):
+        self.key = key
+        self.name = name
+        self.kind = kind
+        self.size = size
+        self.config = config
+        self.keep_rows = keep_rows
+        self.owner = owner
+        self.status = "queued"
+        self.rows = 0
+        self.bytes_done = 0
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._chunks = []
+        self._sums = None
+        self._aggregates = VendorAggregateStore() if kind == "vendor" else None
+        self._frame = None
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def cancel(self):
+        """Stop the job before its next chunk (or before it starts, if still queued)."""
+        self._cancelled.set()
+
+    @property
+    def progress(self):
+        if self.status == "done":
+            return 1.0
+        return min(self.bytes_done / self.size, 1.0) if self.size else 0.0
+
+    def _fold(self, chunk, bytes_done, keep=True):
+        if self._cancelled.is_set():
+            raise JobCancelled()
+        sums = None if self.config is None else summarize_chunk(chunk, self.config)
+        with self._lock:
+            if self._aggregates is not None:
+                self._aggregates.append(chunk)
+            if sums is not None:
+                self._sums = combine_summaries(self._sums, sums)
+            if keep and self.keep_rows:
+                self._chunks.append(chunk)
+            self.rows += len(chunk)
+            self.bytes_done = bytes_done
+
+    def run(self, data, digest=None, chunksize=JOB_CHUNK_ROWS):
+        self.started = time.time()
+        try:
+            if self._cancelled.is_set():
+                raise JobCancelled()
+            self.status = "running"
+            stored = None if digest is None else stored_dataset(self.kind, digest)
+            if stored is not None:
+                # store hit: no CSV parsing, the typed rows are folded in slices
+                for start in range(0, len(stored), chunksize):
+                    end = min(start + chunksize, len(stored))
+                    self._fold(stored.iloc[start:end], self.size * end // len(stored), keep=False)
+                if self.keep_rows and len(stored):
+                    with self._lock:
+                        self._chunks = [stored]
+            else:
+                buffer = io.BytesIO(data)
+                for chunk in iter_typed_chunks(buffer, self.kind, chunksize):
+                    self._fold(chunk, buffer.tell())
+                # summary-only jobs never hold all rows, so only row-keeping jobs fill the store
+                if digest is not None and self.keep_rows and self._chunks:
+                    frame = store_dataset(concat_chunks(self._chunks), self.kind, digest)
+                    with self._lock:
+                        self._chunks = [frame]
+            self.status = "done"
+        except JobCancelled:
+            self.status = "cancelled"
+        except Exception as exc:
+            self.error = str(exc)
+            self.status = "failed"
+        self.finished = time.time()
+
+    def sums(self):
+        """Running per-vendor sums (scored vendor jobs only); a snapshot safe to use while running."""
+        with self._lock:
+            return None if self._sums is None else self._sums.copy()
+
+    def frame(self):
+        """All parsed rows once the job is done, else the rows parsed so far."""
+        if self.status == "done" and self._frame is not None:
+            return self._frame
+        with self._lock:
+            chunks = list(self._chunks)
+            # a finished job usually holds one frame already (store hit or stored rows)
+            frame = chunks[0] if self.status == "done" and len(chunks) == 1 else concat_chunks(chunks)
+            if self.status == "done":
+                self._frame, self._chunks = frame, [frame] if frame is not None else []
+        return frame
+
+    def aggregates(self):
+        return self._aggregates
+
+
+class JobQueue:
+    """Process-wide job pool; identical uploads share one job.
+
+    Jobs that keep their rows are shared across risk configs (callers re-score
+    the rows; the job's own sums are only a progress preview). Summary-only
+    jobs are tied to the config they were scored with, and a newer config from
+    the same owner (a dashboard session) cancels the owner's unfinished jobs
+    for that file.
+    """
+
+    def __init__(self, workers=JOB_WORKERS):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vendowise-job")
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, data, name, kind, config=None, keep_rows=True, owner=None):
+        config_key = None if config is None or keep_rows else risk_config_key(config)
+        key = (kind, source_digest(data), config_key, keep_rows)
+        with self._lock:
+            job = self.jobs.get(key)
+            if job is not None and job.status != "cancelled":
+                self.jobs.move_to_end(key)
+                return job
+            if config_key is not None and owner is not None:
+                self._cancel_superseded(key, owner)
+            job = ScoringJob(key, name, kind, len(data), config, keep_rows, owner)
+            self.jobs[key] = job
+            self.jobs.move_to_end(key)
+            self._evict()
+        self.pool.submit(job.run, data, key[1])
+        return job
+
+    def _cancel_superseded(self, key, owner):
+        for other_key, job in self.jobs.items():
+            if other_key[:2] == key[:2] and other_key != key and job.owner == owner and \
+                    not job.keep_rows and not job.done:
+                job.cancel()
+
+    def _evict(self):
+        finished = [key for key, job in self.jobs.items() if job.done]
+        for key in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[key]
+
+
+# ---------------------------
+# Combining Jobs
+# ---------------------------
+def all_done(jobs):
+    return all(job.done for job in jobs)
+
+
+def combined_frame(jobs):
+    """Rows of every successful job that kept them, or None while any job is still running."""
+    if not jobs or not all_done(jobs):
+        return None
+    return concat_chunks([job.frame() for job in jobs if job.status == "done" and job.keep_rows and job.rows])
+
+
+def combined_summary(jobs, extra_sums=None):
+    """Per-vendor report over the jobs' running sums (partial while jobs run) plus extra_sums, or None."""
+    running = extra_sums
+    for job in jobs:
+        sums = job.sums()
+        if sums is not None:
+            running = combine_summaries(running, sums)
+    return None if running is None else finalize_summary(running)
+
+
+def combined_aggregates(jobs):
+    """Merged VendorAggregateStore of finished vendor jobs, or None while any job is still running."""
+    if not jobs or not all_done(jobs):
+        return None
+    store = VendorAggregateStore()
+    for job in jobs:
+        if job.status == "done" and job.aggregates() is not None:
+            store.merge(job.aggregates())
+    return store
@@ -0,0 +1,121 @@
+import functools
+import logging
+import os
+import pickle
+import warnings
+
+import numpy as np
+
+from vendowise_forest import forest_paths, load_forest
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# Supplier Risk Model Serving
+# ---------------------------
+# The model is loaded at most once per artifact version and process: imported
+# modules outlive Streamlit reruns and are shared by every session on the
+# server, and the cache is keyed on the artifacts' mtimes so a retrained (or
+# newly created) model is picked up without a restart. A flat-array export
+# (vendowise_forest) is preferred over the pickle when one is present.
+MODEL_PATH = "mock_supplier_risk_model.pkl"
+FEATURES = ["Avg_Delay_Days", "Rejection_Rate"]
+HIGH_RISK_PROBABILITY = 0.5
+
+
+def supplier_features(delay_days_sum, delay_count, rejected_qty, ordered_qty):
+    """(Avg_Delay_Days, Rejection_Rate) arrays from per-supplier totals; NaN where undefined.
+
+    The one definition of the model inputs, shared by training (PO ledgers,
+    which have no received quantity) and every scoring path, so scores are
+    on the training scale: rejection rate is rejected / ordered quantity.
+    """
+    def ratio(num, den):
+        num, den = np.asarray(num, dtype="float64"), np.asarray(den, dtype="float64")
+        return np.divide(num, den, out=np.full(den.shape, np.nan), where=den > 0)
+
+    return ratio(delay_days_sum, delay_count), ratio(rejected_qty, ordered_qty)
+
+
+def schema_path(path=MODEL_PATH):
+    """JSON feature schema / training record written next to a model artifact."""
+    return os.path.splitext(path)[0] + ".json"
+
+
+# what a broken or incompatible pickle raises on load
+LOAD_ERRORS = (OSError, EOFError, pickle.UnpicklingError, ImportError, AttributeError, ValueError, KeyError)
+
+
+def model_version(path=MODEL_PATH):
+    """mtimes of the pickle and its flat export (None when missing); changes whenever an artifact does."""
+    return tuple(os.stat(p).st_mtime_ns if os.path.exists(p) else None for p in (path, *forest_paths(path)))
+
+
+def read_model(path=MODEL_PATH):
+    """Load the classifier from disk without caching; None when missing or unloadable (logged)."""
+    try:
+        forest = load_forest(path)
+        if forest is not None:
+            return forest
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Ignoring flat export of %s: %s", path, exc)
+    if not os.path.exists(path):
+        return None
+    try:
+        import joblib  # pulls in sklearn on unpickling; only needed without a flat export
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return joblib.load(path)
+    except LOAD_ERRORS as exc:
+        logger.warning("Could not load supplier risk model %s: %s", path, exc)
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_model(path, version):
+    return read_model(path)
+
+
+def load_model(path=MODEL_PATH):
+    """The fitted classifier, or None when the artifact is missing or can't be loaded."""
+    return _cached_model(path, model_version(path))
+
+
+def model_available(path=MODEL_PATH):
+    return load_model(path) is not None
+
+
+def predict_features(features, path=MODEL_PATH):
+    """High-risk probability for an (n, 2) array of [Avg_Delay_Days, Rejection_Rate].
+
+    Rows with a missing feature get NaN; everything is NaN when no model is available.
+    """
+    features = np.asarray(features, dtype="float64").reshape(-1, len(FEATURES))
+    proba = np.full(len(features), np.nan)
+    model = load_model(path)
+    known = ~np.isnan(features).any(axis=1)
+    if model is not None and known.any():
+        proba[known] = model.predict_proba(features[known])[:, 1]
+    return proba
+
+
+def predict_proba(df, columns=FEATURES, path=MODEL_PATH):
+    """Batched prediction over a DataFrame; columns name its delay and rejection-rate columns."""
+    return predict_features(df[list(columns)].to_numpy(dtype="float64", na_value=np.nan), path)
+
+
+@functools.lru_cache(maxsize=1024)
+def _predict_one(avg_delay_days, rejection_rate, path, version):
+    if _cached_model(path, version) is None:
+        return None
+    return float(predict_features([[avg_delay_days, rejection_rate]], path)[0])
+
+
+def predict_one(avg_delay_days, rejection_rate, path=MODEL_PATH):
+    """Cached single what-if prediction; None when no model is available."""
+    return _predict_one(avg_delay_days, rejection_rate, path, model_version(path))
+
+
+def risk_label(probability):
+    return "High Risk 🔴" if probability >= HIGH_RISK_PROBABILITY else "Low Risk 🟢"
@@ -1,12 +1,15 @@
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+from vendowise_charts import top_n_values
+from vendowise_model import model_available, predict_one, predict_proba, risk_label
+from vendowise_shell import sidebar_logo
+from vendowise_widgets import bar_chart
 
 st.set_page_config(page_title="VendoWise Dashboard", layout="wide")
 
 # Sidebar
-st.sidebar.image("Iniksa-TM.png", width=150)
+sidebar_logo()
 st.sidebar.title("Your Supplier Risk Intelligence Hub")
 nav = st.sidebar.radio("Go to", ["Dashboard", "PO Entry Simulation", "Configuration Panel"])
 
@@ -34,6 +37,8 @@ data["Risk_Score"] = (
     (data["Stock_Buffer"] < min_stock_buffer) |
     (data["Location_Risk"] > max_location_risk)
 ).astype(int)
+if model_available():
+    data["Model_Risk_Prob"] = predict_proba(data).round(2)
 
 # Dashboard
 if nav == "Dashboard":
@@ -41,22 +46,12 @@ if nav == "Dashboard":
     st.dataframe(data)
 
     st.markdown("### 📉 Average Delay by Supplier")
-    fig, ax = plt.subplots()
-    ax.bar(data["Supplier"], data["Avg_Delay_Days"])
-    ax.axhline(y=max_delay, color="red", linestyle="--", label="Threshold")
-    ax.set_ylabel("Avg Delay Days")
-    ax.set_title("Average Delay")
-    ax.legend()
-    st.pyplot(fig)
+    bar_chart(top_n_values(data.set_index("Supplier")["Avg_Delay_Days"]),
+              title="Average Delay", ylabel="Avg Delay Days", threshold=max_delay, rotate=0)
 
     st.markdown("### ❌ Rejection Rate by Supplier")
-    fig2, ax2 = plt.subplots()
-    ax2.bar(data["Supplier"], data["Rejection_Rate"])
-    ax2.axhline(y=max_reject, color="red", linestyle="--", label="Threshold")
-    ax2.set_ylabel("Rejection Rate")
-    ax2.set_title("Rejection Rate")
-    ax2.legend()
-    st.pyplot(fig2)
+    bar_chart(top_n_values(data.set_index("Supplier")["Rejection_Rate"]),
+              title="Rejection Rate", ylabel="Rejection Rate", threshold=max_reject, rotate=0)
 
 elif nav == "PO Entry Simulation":
     st.markdown("## ✏️ PO Entry Simulation")
@@ -74,7 +69,12 @@ elif nav == "PO Entry Simulation":
         stock < min_stock_buffer or
         location > max_location_risk
     ) else "Low Risk 🟢"
-    st.success(f"Predicted Risk for {supplier}: **{risk}**")
+    proba = predict_one(delay, reject)
+    if proba is None:
+        st.success(f"Predicted Risk for {supplier}: **{risk}**")
+    else:
+        st.success(f"Predicted Risk for {supplier}: **{risk_label(proba)}** (model probability {proba:.0%})")
+        st.caption(f"Threshold check: {risk}")
 
 elif nav == "Configuration Panel":
     st.markdown("## ⚙️ Configuration Panel")
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from vendowise_config import ConfigSnapshot
+
+# ---------------------------
+# Risk Rules
+# ---------------------------
+# Each rule owns one bit of the "Risk Bits" column. The toggle is the config key
+# that enables the rule (None = always on), the order is the order reasons are
+# listed in "Risk Reasons".
+RISK_RULES = [
+    ("Delay", None),
+    ("Rejection", "use_rejected_qty"),
+    ("Payment Terms", "use_payment_terms"),
+    ("Low Stock Buffer", "use_stock_buffer"),
+    ("Location Risk", "use_location_risk"),
+    ("Partial Delivery", "use_partial_delivery"),
+]
+RISK_BITS = {reason: 1 << i for i, (reason, _) in enumerate(RISK_RULES)}
+
+
+def as_datetime(col):
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col
+    return pd.to_datetime(col, errors="coerce")
+
+
+def numeric_values(df, column):
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def delivery_delay_days(df):
+    """Whole days between expected and actual delivery (NaN when a date is missing)."""
+    delta = as_datetime(df["actual_delivery_date"]) - as_datetime(df["expected_delivery_date"])
+    return delta.dt.days.to_numpy(dtype="float64")
+
+
+def rejection_rate(df):
+    """rejected_qty / received_qty, 0 where nothing was received."""
+    rejected = numeric_values(df, "rejected_qty")
+    received = numeric_values(df, "received_qty")
+    out = np.zeros(len(df), dtype="float64")
+    np.divide(rejected, received, out=out, where=received != 0)
+    return out
+
+
+def enabled_rules(config):
+    return [reason for reason, toggle in RISK_RULES if toggle is None or config.get(toggle, False)]
+
+
+def rule_masks(df, config):
+    """Boolean NumPy mask per enabled rule, keyed by reason."""
+    thresholds = config["thresholds"]
+    builders = {
+        "Delay": lambda: delivery_delay_days(df) > thresholds["delay_days"],
+        "Rejection": lambda: rejection_rate(df) > thresholds["rejection_rate"],
+        "Payment Terms": lambda: numeric_values(df, "payment_terms_days") > thresholds["payment_terms_days"],
+        "Low Stock Buffer": lambda: numeric_values(df, "stock_buffer_days") < thresholds["min_stock_buffer_days"],
+        "Location Risk": lambda: numeric_values(df, "location_risk") > thresholds["max_location_risk"],
+        "Partial Delivery": lambda: numeric_values(df, "received_qty") < numeric_values(df, "ordered_qty"),
+    }
+    return {reason: builders[reason]() for reason in enabled_rules(config)}
+
+
+def risk_bitmask(df, config):
+    """One uint8 per row with a bit set for every rule that fired."""
+    bits = np.zeros(len(df), dtype=np.uint8)
+    for reason, mask in rule_masks(df, config).items():
+        bits |= mask.astype(np.uint8) * np.uint8(RISK_BITS[reason])
+    return bits
+
+
+def reasons_for_bits(value):
+    return [reason for reason, _ in RISK_RULES if value & RISK_BITS[reason]]
+
+
+def decode_reasons(bits, sep=", "):
+    """Categorical of joined reasons; labels are built once per distinct bitmask."""
+    codes, inverse = np.unique(np.asarray(bits), return_inverse=True)
+    labels = [sep.join(reasons_for_bits(int(code))) for code in codes]
+    return pd.Categorical.from_codes(inverse.ravel(), categories=labels)
+
+
+def reason_counts(bits):
+    """Number of rows flagged per reason, most frequent first (zero counts dropped)."""
+    bits = np.asarray(bits)
+    counts = {reason: int(np.count_nonzero(bits & RISK_BITS[reason])) for reason, _ in RISK_RULES}
+    counts = pd.Series(counts, dtype="int64")
+    return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+
+def risk_config_key(config):
+    """Hashable cache key for scoring: a snapshot's content digest, else the toggles + thresholds of a dict."""
+    if isinstance(config, ConfigSnapshot):
+        return config.key
+    toggles = tuple((toggle, bool(config.get(toggle, False))) for _, toggle in RISK_RULES if toggle)
+    return toggles + tuple(sorted(config["thresholds"].items()))
+
+
+def apply_risk_flags(df, config):
+    """Add "Risk Bits" and categorical "Risk Reasons" columns to df in place and return it."""
+    bits = risk_bitmask(df, config)
+    df["Risk Bits"] = bits
+    df["Risk Reasons"] = decode_reasons(bits)
+    return df
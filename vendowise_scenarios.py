@@ -0,0 +1,192 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from vendowise_model import FEATURES, HIGH_RISK_PROBABILITY, MODEL_PATH, predict_features, supplier_features
+from vendowise_risk_engine import (RISK_BITS, decode_reasons, delivery_delay_days, enabled_rules, numeric_values,
+                                   reason_counts as bits_reason_counts)
+
+# ---------------------------
+# Vendor Profiles
+# ---------------------------
+# profile column -> (reason, direction, threshold key, bounds). "above" rules
+# flag value > t, "below" rules value < t, as in vendowise_risk_engine; a
+# threshold key of None means the fixed threshold 1.0 (any short delivery).
+# Perturbed values are clipped to bounds.
+SCENARIO_METRICS = {
+    "avg_delay_days": ("Delay", "above", "delay_days", (-np.inf, np.inf)),
+    "rejection_rate": ("Rejection", "above", "rejection_rate", (0.0, 1.0)),
+    "payment_terms_days": ("Payment Terms", "above", "payment_terms_days", (0.0, np.inf)),
+    "stock_buffer_days": ("Low Stock Buffer", "below", "min_stock_buffer_days", (0.0, np.inf)),
+    "location_risk": ("Location Risk", "above", "max_location_risk", (0.0, 10.0)),
+    "fill_rate": ("Partial Delivery", "below", None, (0.0, 1.0)),
+}
+PROFILE_COLUMNS = list(SCENARIO_METRICS)
+# profile columns fed to the risk model, in vendowise_model.FEATURES order
+MODEL_COLUMNS = ["avg_delay_days", "rejection_rate"]
+
+
+def _ratio(num, den):
+    return num / den.where(den > 0)
+
+
+def vendor_profile(df, vendor_column="vendor_name"):
+    """One row per vendor with the metrics the threshold rules and the model look at.
+
+    Term/buffer/location columns are per-PO means. Delay and rejection rate are
+    the model's features (vendowise_model.supplier_features, rejection over
+    ordered quantity), so profiles score on the training scale; fill rate is
+    received over ordered quantity.
+    """
+    delay = delivery_delay_days(df)
+    frame = pd.DataFrame({
+        "delay_days_sum": np.nan_to_num(delay),
+        "delay_count": (~np.isnan(delay)).astype("float64"),
+        "payment_terms_days": numeric_values(df, "payment_terms_days"),
+        "stock_buffer_days": numeric_values(df, "stock_buffer_days"),
+        "location_risk": numeric_values(df, "location_risk"),
+        "ordered_qty": numeric_values(df, "ordered_qty"),
+        "received_qty": numeric_values(df, "received_qty"),
+        "rejected_qty": numeric_values(df, "rejected_qty"),
+    }, index=df.index)
+    grouped = frame.groupby(df[vendor_column], observed=True, sort=True)
+    means = grouped[["payment_terms_days", "stock_buffer_days", "location_risk"]].mean()
+    totals = grouped[["delay_days_sum", "delay_count", "ordered_qty", "received_qty", "rejected_qty"]].sum()
+    avg_delay, rejection = supplier_features(totals["delay_days_sum"], totals["delay_count"],
+                                             totals["rejected_qty"], totals["ordered_qty"])
+    means["avg_delay_days"] = avg_delay
+    means["rejection_rate"] = np.nan_to_num(rejection)
+    means["fill_rate"] = _ratio(totals["received_qty"], totals["ordered_qty"])
+    means.index = means.index.astype(object)
+    return means[PROFILE_COLUMNS]
+
+
+# ---------------------------
+# Scenario Grids
+# ---------------------------
+def scenario_grid(**steps):
+    """Every combination of additive shifts, one scenario per row.
+
+    Keywords are profile columns with a list of shifts in that column's units,
+    e.g. scenario_grid(avg_delay_days=[0, 3, 7], rejection_rate=[0, 0.01]).
+    Columns without steps are not shifted.
+    """
+    unknown = set(steps) - set(PROFILE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown scenario columns: {', '.join(sorted(unknown))}")
+    values = [np.atleast_1d(np.asarray(steps.get(col, [0.0]), dtype="float64")) for col in PROFILE_COLUMNS]
+    grid = pd.DataFrame(list(itertools.product(*values)), columns=PROFILE_COLUMNS)
+    grid.index.name = "scenario"
+    return grid
+
+
+def scenario_labels(scenarios):
+    """Readable name per scenario, listing only the shifted columns."""
+    labels = []
+    for _, row in scenarios.iterrows():
+        parts = [f"{col} {value:+g}" for col, value in row.items() if value]
+        labels.append(", ".join(parts) or "baseline")
+    return labels
+
+
+# ---------------------------
+# Evaluation
+# ---------------------------
+def _shifted(profile, scenarios, col):
+    """(vendors x scenarios) values of one profile column under every scenario."""
+    lo, hi = SCENARIO_METRICS[col][3]
+    shifted = profile[col].to_numpy(dtype="float64")[:, None] + scenarios[col].to_numpy(dtype="float64")[None, :]
+    return np.clip(shifted, lo, hi)
+
+
+def _rule_bits(profile, scenarios, config):
+    bits = np.zeros((len(profile), len(scenarios)), dtype=np.uint8)
+    enabled = set(enabled_rules(config))
+    for col, (reason, direction, key, _) in SCENARIO_METRICS.items():
+        if reason not in enabled:
+            continue
+        threshold = 1.0 if key is None else config["thresholds"][key]
+        values = _shifted(profile, scenarios, col)
+        fired = values > threshold if direction == "above" else values < threshold
+        bits |= fired.astype(np.uint8) * np.uint8(RISK_BITS[reason])
+    return bits
+
+
+def _model_proba(profile, scenarios, model_path=MODEL_PATH):
+    """High-risk probability per (vendor, scenario); each distinct model-input shift is predicted once."""
+    shifts, inverse = np.unique(scenarios[MODEL_COLUMNS].to_numpy(dtype="float64"), axis=0, return_inverse=True)
+    shift_frame = pd.DataFrame(shifts, columns=MODEL_COLUMNS)
+    features = np.stack([_shifted(profile, shift_frame, col) for col in MODEL_COLUMNS], axis=-1)
+    proba = predict_features(features.reshape(-1, len(FEATURES)), model_path).reshape(len(profile), len(shifts))
+    return proba[:, inverse.ravel()].astype("float32")
+
+
+def evaluate_scenarios(profile, scenarios, config, use_model=True, model_path=MODEL_PATH):
+    """Score every vendor under every scenario at once; returns a ScenarioMatrix."""
+    bits = _rule_bits(profile, scenarios, config)
+    if use_model:
+        proba = _model_proba(profile, scenarios, model_path)
+    else:
+        proba = np.full(bits.shape, np.nan, dtype="float32")
+    return ScenarioMatrix(profile, scenarios, bits, proba)
+
+
+class ScenarioMatrix:
+    """Rule bitmasks and model probabilities for vendors (rows) x scenarios (columns).
+
+    Only the uint8 bits and float32 probabilities are kept per cell; per-vendor
+    values under a scenario are recomputed from the profile when sliced.
+    """
+
+    def __init__(self, profile, scenarios, bits, proba):
+        self.profile = profile
+        self.scenarios = scenarios
+        self.bits = bits
+        self.proba = proba
+
+    @property
+    def shape(self):
+        return self.bits.shape
+
+    @property
+    def has_model(self):
+        return not np.isnan(self.proba).all()
+
+    def flagged(self):
+        """Boolean (vendors x scenarios) matrix of vendors any enabled rule flags."""
+        return self.bits != 0
+
+    def high_risk(self, probability=HIGH_RISK_PROBABILITY):
+        return self.proba >= probability
+
+    def summary(self, probability=HIGH_RISK_PROBABILITY):
+        """One row per scenario: its shifts and how many vendors the rules and the model flag."""
+        out = self.scenarios.copy()
+        out.insert(0, "label", scenario_labels(self.scenarios))
+        out["rule_flagged"] = self.flagged().sum(axis=0)
+        if self.has_model:
+            out["model_high_risk"] = self.high_risk(probability).sum(axis=0)
+            out["mean_probability"] = np.nanmean(self.proba, axis=0)
+        return out
+
+    def scenario(self, i):
+        """Per-vendor values, reasons and model probability under scenario i."""
+        row = self.scenarios.iloc[[i]]
+        out = pd.DataFrame({col: _shifted(self.profile, row, col)[:, 0] for col in PROFILE_COLUMNS},
+                           index=self.profile.index)
+        out["Risk Reasons"] = decode_reasons(self.bits[:, i])
+        out["probability"] = self.proba[:, i]
+        return out
+
+    def vendor(self, name):
+        """One vendor's reasons and model probability across all scenarios."""
+        i = self.profile.index.get_loc(name)
+        out = self.scenarios.copy()
+        out["Risk Reasons"] = decode_reasons(self.bits[i])
+        out["probability"] = self.proba[i]
+        return out
+
+    def reason_counts(self, i):
+        """Vendors flagged per reason under scenario i."""
+        return bits_reason_counts(self.bits[:, i])
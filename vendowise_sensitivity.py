@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from vendowise_risk_engine import delivery_delay_days, numeric_values, rejection_rate
+
+# ---------------------------
+# Threshold Rules
+# ---------------------------
+# reason -> (metric, direction, threshold key, slider range). "above" rules flag
+# metric > t, "below" rules flag metric < t, matching vendowise_risk_engine.
+SWEEP_RULES = {
+    "Delay": (delivery_delay_days, "above", "delay_days", (0, 30)),
+    "Rejection": (rejection_rate, "above", "rejection_rate", (0.0, 0.2)),
+    "Payment Terms": (lambda df: numeric_values(df, "payment_terms_days"), "above", "payment_terms_days", (15, 120)),
+    "Low Stock Buffer": (lambda df: numeric_values(df, "stock_buffer_days"), "below", "min_stock_buffer_days", (0, 30)),
+    "Location Risk": (lambda df: numeric_values(df, "location_risk"), "above", "max_location_risk", (0, 10)),
+}
+SWEEP_POINTS = 101
+
+
+class SensitivityIndex:
+    """Sorted metric columns answering "how many POs/vendors does threshold t flag" by binary search.
+
+    Building sorts every metric once (O(n log n)); each count afterwards is
+    O(log n), so whole sweep curves cost O(points * log n) regardless of rows.
+    At vendor level a vendor counts as flagged when its worst PO is.
+    """
+
+    def __init__(self, df, vendor_column="vendor_name"):
+        self.po = {}
+        self.vendor = {}
+        for reason, (metric, direction, _, _) in SWEEP_RULES.items():
+            try:
+                values = metric(df)
+            except KeyError:
+                continue
+            self.po[reason] = np.sort(values[~np.isnan(values)])
+            if vendor_column in df.columns:
+                grouped = pd.Series(values, index=df.index).groupby(df[vendor_column], observed=True)
+                worst = grouped.max() if direction == "above" else grouped.min()
+                worst = worst.to_numpy(dtype="float64")
+                self.vendor[reason] = np.sort(worst[~np.isnan(worst)])
+
+    def _sorted(self, reason, level):
+        return (self.po if level == "po" else self.vendor)[reason]
+
+    def flagged_count(self, reason, threshold, level="po"):
+        """Number of POs (level="po") or vendors (level="vendor") the rule flags at threshold."""
+        values = self._sorted(reason, level)
+        if SWEEP_RULES[reason][1] == "above":
+            return len(values) - np.searchsorted(values, threshold, side="right")
+        return np.searchsorted(values, threshold, side="left")
+
+    def sweep(self, reason, thresholds=None, level="po"):
+        """Flag count for every threshold of the grid (default: the rule's slider range)."""
+        if thresholds is None:
+            lo, hi = SWEEP_RULES[reason][3]
+            thresholds = np.linspace(lo, hi, SWEEP_POINTS)
+        thresholds = np.asarray(thresholds, dtype="float64")
+        return pd.Series(self.flagged_count(reason, thresholds, level), index=pd.Index(thresholds, name=reason),
+                         name="flagged")
+
+    def current_counts(self, config, level="po"):
+        """Flag count per available rule at the configured thresholds."""
+        return pd.Series({reason: int(self.flagged_count(reason, config["thresholds"][SWEEP_RULES[reason][2]], level))
+                          for reason in self.reasons(level)}, dtype="int64")
+
+    def reasons(self, level="po"):
+        """Rules the index can answer at this level (the data has their columns)."""
+        return [reason for reason in SWEEP_RULES if reason in (self.po if level == "po" else self.vendor)]
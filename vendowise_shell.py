@@ -0,0 +1,63 @@
+import io
+import os
+
+import streamlit as st
+
+# ---------------------------
+# Light App Shell
+# ---------------------------
+# Login screens and branding shared by the dashboards. This module only
+# imports Streamlit, so a script can render its login page before it imports
+# any data, model or plotting module.
+LOGO_PATH = "Iniksa-TM.png"
+LOGO_WIDTH = 150
+LOGO_SCALE = 2  # pixels per displayed pixel, for high-DPI screens
+
+
+@st.cache_resource(show_spinner=False)
+def _logo_png(path, mtime_ns, width):
+    from PIL import Image
+
+    with Image.open(path) as image:
+        height = round(image.height * width / image.width)
+        image = image.resize((width, height), Image.LANCZOS)
+        buf = io.BytesIO()
+        image.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def sidebar_logo(path=LOGO_PATH, width=LOGO_WIDTH):
+    """Sidebar logo, downscaled once per process instead of shipping the full-size file on every rerun."""
+    try:
+        st.sidebar.image(_logo_png(path, os.stat(path).st_mtime_ns, width * LOGO_SCALE), width=width)
+    except (OSError, ValueError):
+        st.sidebar.markdown("**VendoWise**")
+
+
+def check_password():
+    def password_entered():
+        if st.session_state["password"] == "vendowise123":
+            st.session_state["password_correct"] = True
+        else:
+            st.session_state["password_correct"] = False
+
+    if "password_correct" not in st.session_state:
+        st.text_input("Enter password", type="password", on_change=password_entered, key="password")
+        st.stop()
+    elif not st.session_state["password_correct"]:
+        st.text_input("Enter password", type="password", on_change=password_entered, key="password")
+        st.error("😕 Password incorrect")
+        st.stop()
+
+
+def login():
+    st.title("🔐 VendoWise Login")
+    username = st.text_input("Username")
+    password = st.text_input("Password", type="password")
+    if st.button("Login"):
+        if username == "admin" and password == "vendowise123":
+            st.session_state["logged_in"] = True
+            st.rerun()
+        else:
+            st.error("Invalid credentials")
+            st.stop()
@@ -0,0 +1,90 @@
+import hashlib
+import io
+import os
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from vendowise_ingest import read_typed_csv
+
+# ---------------------------
+# Columnar Dataset Store
+# ---------------------------
+# Validated, typed datasets are persisted as uncompressed Arrow IPC files named
+# after the source content hash, so a changed source simply misses the store and
+# later loads of an unchanged one skip CSV parsing and typing. The dashboards
+# work on pandas frames, so a hit still builds one from the Arrow columns; what
+# it saves is the text parsing, not the copy.
+STORE_DIR = ".vendowise_store"
+HASH_BLOCK_BYTES = 8 * 1024 * 1024
+STORE_MAX_FILES = 32
+
+
+def source_digest(source):
+    """Content hash of a path, raw bytes or an uploaded file."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+                h.update(block)
+    else:
+        h.update(source if isinstance(source, bytes) else source.getvalue())
+    return h.hexdigest()
+
+
+def store_path(kind, digest, store_dir=STORE_DIR):
+    return os.path.join(store_dir, f"{kind}-{digest}.arrow")
+
+
+def _readable(source):
+    if isinstance(source, (str, os.PathLike)):
+        return source
+    return io.BytesIO(source if isinstance(source, bytes) else source.getvalue())
+
+
+def write_dataset(df, path):
+    """Write df as an uncompressed Arrow file; atomic so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+def read_dataset(path):
+    return feather.read_table(path).to_pandas()
+
+
+def prune_store(store_dir=STORE_DIR, keep=STORE_MAX_FILES):
+    """Drop the least recently written datasets beyond the newest `keep`."""
+    paths = [os.path.join(store_dir, name) for name in os.listdir(store_dir) if name.endswith(".arrow")]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    for path in paths[keep:]:
+        os.remove(path)
+
+
+def stored_dataset(kind, digest, store_dir=STORE_DIR):
+    """The stored dataset for a source digest, or None on a miss."""
+    try:
+        return read_dataset(store_path(kind, digest, store_dir))
+    except FileNotFoundError:
+        return None
+
+
+def store_dataset(df, kind, digest, store_dir=STORE_DIR):
+    """Persist df under its source digest and return it."""
+    try:
+        write_dataset(df, store_path(kind, digest, store_dir))
+        prune_store(store_dir)
+    except OSError:
+        # a read-only or full disk only costs us the next load, not this one
+        pass
+    return df
+
+
+def load_dataset(source, kind, store_dir=STORE_DIR):
+    """Typed dataset for source: from the store on a hit, parsed from CSV and persisted on a miss."""
+    digest = source_digest(source)
+    df = stored_dataset(kind, digest, store_dir)
+    if df is None:
+        df = store_dataset(read_typed_csv(_readable(source), kind), kind, digest, store_dir)
+    return df
@@ -0,0 +1,111 @@
+"""Seeded synthetic data in the shape of the sample CSVs.
+
+    python vendowise_synthetic.py vendor 1000000 vendor_1m.csv --seed 7
+
+Same seed and row count always give the same frame, so benchmark runs are
+comparable across releases.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+BASE_DATE = np.datetime64("2024-01-01")
+
+
+def _dates(days):
+    return pd.to_datetime(BASE_DATE + days.astype("timedelta64[D]"))
+
+
+def generate_vendor_data(rows, seed=0, vendors=None, items=None):
+    """vendor_data.csv-schema PO history; each vendor has its own delay and rejection profile."""
+    rng = np.random.default_rng(seed)
+    vendors = vendors or max(5, rows // 40)
+    items = items or max(5, rows // 20)
+
+    vendor = rng.integers(0, vendors, rows)
+    mean_delay = rng.gamma(2.0, 1.5, vendors) - 1
+    reject_rate = rng.beta(1.5, 40, vendors)
+
+    po_day = rng.integers(0, 365, rows)
+    lead = rng.integers(5, 21, rows)
+    delay = np.rint(rng.normal(mean_delay[vendor], 2.5)).astype("int64")
+    ordered = rng.integers(50, 501, rows)
+    partial = rng.random(rows) < 0.1
+    received = np.where(partial, (ordered * rng.uniform(0.5, 1.0, rows)).astype("int64"), ordered)
+    actual = _dates(po_day + lead + delay)
+    actual = actual.where(rng.random(rows) >= 0.01)  # ~1% still open
+
+    return pd.DataFrame({
+        "vendor_name": pd.Index([f"Vendor {v:05d}" for v in range(vendors)])[vendor],
+        "item_code": pd.Index([f"ITEM{i:06d}" for i in range(items)])[rng.integers(0, items, rows)],
+        "po_number": [f"PO{i:09d}" for i in range(rows)],
+        "po_date": _dates(po_day),
+        "expected_delivery_date": _dates(po_day + lead),
+        "actual_delivery_date": actual,
+        "ordered_qty": ordered,
+        "received_qty": received,
+        "rejected_qty": rng.binomial(received, reject_rate[vendor]),
+        "freight_cost": rng.integers(200, 2001, rows),
+        "payment_terms_days": rng.choice([30, 45, 60, 90], rows),
+        "stock_buffer_days": rng.integers(0, 21, rows),
+        "location_risk": rng.integers(0, 11, rows),
+    })
+
+
+def generate_inventory_data(rows, seed=0):
+    """inventory_data.csv-schema SKU list; ~10% of items have no open PO."""
+    rng = np.random.default_rng(seed)
+    has_po = rng.random(rows) >= 0.1
+    return pd.DataFrame({
+        "Item Code": [f"ITEM{i:06d}" for i in range(rows)],
+        "Item Description": [f"Item {i}" for i in range(rows)],
+        "Current Stock (Qty)": rng.integers(0, 1001, rows),
+        "Daily Avg Consumption": rng.integers(1, 51, rows),
+        "Buffer Stock (days)": rng.integers(3, 11, rows),
+        "Next PO Delivery Date": _dates(200 + rng.integers(0, 31, rows)).where(has_po),
+        "PO Delivery Qty": np.where(has_po, rng.integers(100, 1001, rows), 0),
+        "Expected Delay (days)": np.where(has_po, rng.integers(0, 11, rows), 0),
+    })
+
+
+def generate_supplier_ledger(rows, seed=0, suppliers=None):
+    """sample_supplier_data.csv-schema PO ledger."""
+    rng = np.random.default_rng(seed)
+    suppliers = suppliers or max(4, rows // 40)
+    supplier = rng.integers(0, suppliers, rows)
+    mean_delay = rng.gamma(2.0, 1.5, suppliers) - 1
+    order_day = rng.integers(0, 365, rows)
+    promised = order_day + rng.integers(5, 21, rows)
+    qty = rng.integers(50, 501, rows)
+    return pd.DataFrame({
+        "Supplier": pd.Index([f"Supplier {s:05d}" for s in range(suppliers)])[supplier],
+        "PO_Number": [f"PO{i:09d}" for i in range(rows)],
+        "Order_Date": _dates(order_day),
+        "Promised_Date": _dates(promised),
+        "Received_Date": _dates(promised + np.rint(rng.normal(mean_delay[supplier], 2.5)).astype("int64")),
+        "Qty_Ordered": qty,
+        "Qty_Rejected": rng.binomial(qty, rng.beta(1.5, 40, suppliers)[supplier]),
+    })
+
+
+GENERATORS = {
+    "vendor": generate_vendor_data,
+    "inventory": generate_inventory_data,
+    "ledger": generate_supplier_ledger,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write seeded synthetic VendoWise data.")
+    parser.add_argument("kind", choices=sorted(GENERATORS))
+    parser.add_argument("rows", type=int)
+    parser.add_argument("out", help="output CSV path")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    GENERATORS[args.kind](args.rows, seed=args.seed).to_csv(args.out, index=False, date_format="%Y-%m-%d")
+    print(f"✅ {args.rows:,} {args.kind} rows written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# Server-side Table Paging
+# ---------------------------
+# Filtering, sorting and paging happen here on the full scored frame; only the
+# visible page is styled and handed to st.dataframe.
+PAGE_SIZE = 50
+
+RED = "background-color: red"
+ORANGE = "background-color: orange"
+
+
+def _bool_mask(result):
+    return pd.Series(result).fillna(False).to_numpy(dtype=bool)
+
+
+def text_columns(df):
+    return [col for col in df.columns
+            if isinstance(df[col].dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(df[col].dtype)
+            or df[col].dtype == object]
+
+
+def contains_mask(series, query):
+    """Case-insensitive substring match; categoricals are matched once per category."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        hits = series.cat.categories.astype(str).str.contains(query, case=False, regex=False)
+        codes = series.cat.codes.to_numpy()
+        return np.where(codes >= 0, np.asarray(hits, dtype=bool)[codes], False)
+    return _bool_mask(series.astype("string").str.contains(query, case=False, regex=False))
+
+
+def filter_rows(df, query, columns=None):
+    """Rows where any of columns (default: the text columns) contains query."""
+    if not query:
+        return df
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns or text_columns(df):
+        mask |= contains_mask(df[col], query)
+    return df[mask]
+
+
+def sorted_page(df, column=None, ascending=True, start=0, stop=PAGE_SIZE):
+    """Rows start:stop of df ordered by column.
+
+    Numeric columns use argpartition, so only the first `stop` rows are fully
+    sorted; missing values always go last.
+    """
+    if column is None:
+        return df.iloc[start:stop]
+    values = df[column]
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype) \
+            and stop < len(df):
+        key = values.to_numpy(dtype="float64", na_value=np.nan)
+        key = np.where(np.isnan(key), np.inf, key if ascending else -key)
+        top = np.argpartition(key, stop - 1)[:stop]
+        top = top[np.argsort(key[top], kind="stable")]
+        return df.iloc[top[start:stop]]
+    return df.sort_values(column, ascending=ascending, kind="stable", na_position="last").iloc[start:stop]
+
+
+def page_count(rows, page_size=PAGE_SIZE):
+    return max(1, -(-rows // page_size))
+
+
+def highlight_styles(page, rules):
+    """CSS frame for one page.
+
+    rules are (column, predicate, css) triples; predicate gets the whole column
+    and returns a boolean mask, so each rule is one vectorized call.
+    """
+    css = pd.DataFrame("", index=page.index, columns=page.columns)
+    for column, predicate, style in rules:
+        if column in page.columns:
+            css.loc[_bool_mask(predicate(page[column])), column] = style
+    return css
+
+
+def style_page(page, rules):
+    if not rules:
+        return page
+    return page.style.apply(lambda frame: highlight_styles(frame, rules), axis=None)
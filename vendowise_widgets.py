@@ -0,0 +1,174 @@
+import uuid
+
+import numpy as np
+import streamlit as st
+
+from vendowise_cache import job_queue
+from vendowise_charts import render_bar_png
+from vendowise_diagnostics import finish_run, stage
+from vendowise_jobs import all_done, combined_summary
+from vendowise_risk_engine import risk_config_key
+from vendowise_scenarios import evaluate_scenarios, scenario_grid
+from vendowise_tables import ORANGE, PAGE_SIZE, filter_rows, page_count, sorted_page, style_page
+
+# ---------------------------
+# Shared Dashboard Components
+# ---------------------------
+def sensitivity_panel(index, config, key="sensitivity"):
+    """Flag counts at the configured thresholds plus a sweep curve per rule."""
+    level = st.radio("Count flagged", ["POs", "Vendors"], horizontal=True, key=f"{key}_level")
+    level = "po" if level == "POs" else "vendor"
+    reasons = index.reasons(level)
+    if not reasons:
+        st.info("No threshold rules can be evaluated on this data.")
+        return
+
+    counts = index.current_counts(config, level)
+    for col, reason in zip(st.columns(len(reasons)), reasons):
+        col.metric(reason, f"{counts[reason]:,}")
+
+    for i in range(0, len(reasons), 2):
+        for col, reason in zip(st.columns(2), reasons[i:i + 2]):
+            col.caption(f"{reason}: flagged vs. threshold")
+            col.line_chart(index.sweep(reason, level=level).to_frame(), height=200)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _scenario_matrix(profile, delay_shifts, rejection_shifts, config_key, _config):
+    grid = scenario_grid(avg_delay_days=delay_shifts, rejection_rate=rejection_shifts)
+    return evaluate_scenarios(profile, grid, _config)
+
+
+def scenario_panel(profile, config, key="scenarios"):
+    """Portfolio what-if: every vendor under a grid of added delay and rejection, as one matrix."""
+    delay_col, delay_step_col, reject_col, reject_step_col = st.columns(4)
+    max_delay = delay_col.number_input("Max added delay (days)", 0, 60, 7, key=f"{key}_delay")
+    delay_step = delay_step_col.number_input("Delay step (days)", 1, 30, 1, key=f"{key}_delay_step")
+    max_reject = reject_col.number_input("Max added rejection (pts)", 0.0, 20.0, 3.0, 0.5, key=f"{key}_reject")
+    reject_step = reject_step_col.number_input("Rejection step (pts)", 0.1, 10.0, 1.0, 0.1, key=f"{key}_reject_step")
+    delay_shifts = tuple(float(d) for d in np.arange(0, max_delay + 1, delay_step))
+    rejection_shifts = tuple(round(float(r), 6) / 100 for r in np.arange(0, max_reject + reject_step / 2, reject_step))
+
+    with stage("scenario matrix"):
+        matrix = _scenario_matrix(profile, delay_shifts, rejection_shifts, risk_config_key(config), config)
+        summary = matrix.summary()
+    measure = "model_high_risk" if matrix.has_model else "rule_flagged"
+    grid = summary.pivot(index="avg_delay_days", columns="rejection_rate", values=measure)
+    grid.index = [f"+{d:g} days" for d in grid.index]
+    grid.columns = [f"+{r * 100:g} pts" for r in grid.columns]
+    st.caption(f"Vendors out of {len(profile):,} flagged {'by the model' if matrix.has_model else 'by the rules'} "
+               f"per scenario ({matrix.shape[1]:,} scenarios): rows add delay, columns add rejection")
+    st.dataframe(grid)
+
+    scenario = st.selectbox("Inspect scenario", summary.index, format_func=lambda i: summary.at[i, "label"],
+                            key=f"{key}_pick")
+    st.caption(f"Rule flags: {int(summary.at[scenario, 'rule_flagged']):,} vendors")
+    paged_table(matrix.scenario(scenario).reset_index(), key=f"{key}_vendors",
+                highlight=[("Risk Reasons", lambda s: s != "", ORANGE)])
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _bar_png(labels, values, title, xlabel, ylabel, threshold, figsize, rotate):
+    return render_bar_png(labels, values, title, xlabel, ylabel, threshold, figsize, rotate)
+
+
+def bar_chart(series, title="", xlabel="", ylabel="", threshold=None, figsize=(8, 4), rotate=45):
+    """Bar chart of an aggregated Series; the PNG is cached on its values, labels and threshold."""
+    with stage(f"chart: {title or ylabel}"):
+        labels = tuple(str(label) for label in series.index)
+        values = tuple(float(v) for v in series.to_numpy(dtype="float64"))
+        st.image(_bar_png(labels, values, title, xlabel, ylabel, threshold, figsize, rotate))
+
+
+def paged_table(df, key, highlight=(), search_columns=None, page_size=PAGE_SIZE):
+    """Filterable, sortable table that only styles and sends the visible page."""
+    filter_col, sort_col, order_col = st.columns([3, 2, 1])
+    query = filter_col.text_input("Filter rows", key=f"{key}_query", placeholder="Search text columns")
+    sort_by = sort_col.selectbox("Sort by", ["(original order)"] + list(df.columns), key=f"{key}_sort")
+    descending = order_col.checkbox("Descending", key=f"{key}_desc")
+
+    with stage(f"table: {key}"):
+        view = filter_rows(df, query, search_columns)
+        pages = page_count(len(view), page_size)
+        page_key = f"{key}_page"
+        if st.session_state.get(page_key, 1) > pages:
+            st.session_state[page_key] = pages
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+
+        start = (page - 1) * page_size
+        column = None if sort_by == "(original order)" else sort_by
+        rows = sorted_page(view, column, not descending, start, start + page_size)
+        st.caption(f"{len(view):,} of {len(df):,} rows · page {page} of {pages}")
+        st.dataframe(style_page(rows, highlight))
+
+
+# ---------------------------
+# Background Uploads
+# ---------------------------
+JOB_REFRESH_SECONDS = 1.0
+
+
+def submit_uploads(files, kind, config=None, max_row_bytes=None):
+    """Hand uploaded files to the background job pool; returns their jobs in upload order.
+
+    Files above max_row_bytes only keep their per-vendor sums, not their rows;
+    a newer config cancels this session's earlier sum jobs for the same file.
+    """
+    queue = job_queue()
+    owner = st.session_state.setdefault("upload_owner", uuid.uuid4().hex)
+    return [queue.submit(f.getvalue(), f.name, kind, config,
+                         keep_rows=max_row_bytes is None or f.size <= max_row_bytes, owner=owner)
+            for f in files or []]
+
+
+def _job_progress(jobs, partial):
+    if all_done(jobs):
+        rerun()
+    for job in jobs:
+        st.progress(job.progress, text=f"{job.name}: {job.rows:,} rows · {job.status}")
+    summary = combined_summary(jobs) if partial else None
+    if summary is not None:
+        st.caption(f"Partial results: {int(summary['po_count'].sum()):,} POs scored so far")
+        st.dataframe(summary.head(PAGE_SIZE))
+
+
+if hasattr(st, "fragment"):
+    _job_progress_live = st.fragment(run_every=JOB_REFRESH_SECONDS)(_job_progress)
+else:
+    def _job_progress_live(jobs, partial):
+        _job_progress(jobs, partial)
+        st.button("🔄 Refresh progress")
+
+
+def upload_status(jobs, partial=False):
+    """Live progress (and partial per-vendor results) until every job finishes, then any errors."""
+    if not jobs:
+        return
+    if not all_done(jobs):
+        _job_progress_live(jobs, partial)
+    for job in jobs:
+        if job.status == "failed":
+            st.error(f"{job.name}: {job.error}")
+
+
+# ---------------------------
+# Diagnostics
+# ---------------------------
+def diagnostics_panel():
+    """Per-stage timings of this run in a sidebar expander; nothing is shown unless diagnostics are on."""
+    records = finish_run()
+    if records:
+        with st.sidebar.expander("🩺 Diagnostics"):
+            st.dataframe(records, hide_index=True)
+
+
+def stop():
+    """st.stop() for instrumented scripts: the run's diagnostics are still logged and shown."""
+    diagnostics_panel()
+    st.stop()
+
+
+def rerun():
+    """st.rerun() for instrumented scripts: the run's diagnostics are logged first."""
+    finish_run()
+    st.rerun()